@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Benchmark entry point for the Kids 2048 game.
+
+Runs headless games with the AI policies from utils.policies. For example:
+
+    python bench.py tournament --games 200 --policies random,greedy,expectimax
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.constants import MAX_GRID_SIZE, MIN_GRID_SIZE
+from utils.policies import POLICIES
+from utils.replay import MAX_SEED
+from utils.simulation import play_game
+
+METRICS = ("score", "max_tile", "moves", "moves_per_sec")
+PERCENTILES = (0, 25, 50, 75, 90, 99, 100)
+
+
+def _play_game_args(args):
+    """Unpack a task tuple for ProcessPoolExecutor.map."""
+    return play_game(*args)
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0
+    rank = round(pct / 100 * (len(sorted_values) - 1))
+    return sorted_values[rank]
+
+
+def summarize(results):
+    """Aggregate per-game results into percentile tables per policy."""
+    by_policy = {}
+    for result in results:
+        by_policy.setdefault(result["policy"], []).append(result)
+
+    summary = {}
+    for policy, games in by_policy.items():
+        summary[policy] = {"games": len(games)}
+        for metric in METRICS:
+            values = sorted(game[metric] for game in games)
+            summary[policy][metric] = {
+                "mean": sum(values) / len(values),
+                **{f"p{pct}": percentile(values, pct) for pct in PERCENTILES},
+            }
+    return summary
+
+
+def print_summary(summary, out=sys.stdout):
+    """Print the percentile tables as plain text."""
+    headers = ["mean"] + [f"p{pct}" for pct in PERCENTILES]
+    for policy, stats in summary.items():
+        print(f"\n{policy} ({stats['games']} games)", file=out)
+        print(f"{'metric':<14}" + "".join(f"{h:>12}" for h in headers), file=out)
+        for metric in METRICS:
+            row = stats[metric]
+            print(f"{metric:<14}" + "".join(f"{row[h]:>12.1f}" for h in headers), file=out)
+
+
+def run_tournament(policies, games, seed=0, workers=None, size=4, depth=2, time_limit=None, max_moves=None):
+    """Play games with every policy across a process pool.
+
+    Game i of every policy uses seed + i, so each policy faces the same
+    sequence of seeds and reruns give the same results.
+    """
+    tasks = [
+        (policy, seed + i, size, depth, time_limit, max_moves)
+        for policy in policies
+        for i in range(games)
+    ]
+    workers = workers or os.cpu_count() or 1
+    # Large chunks keep inter-process overhead low; several per worker balance the load
+    chunksize = max(1, len(tasks) // (workers * 4))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_play_game_args, tasks, chunksize=chunksize))
+
+
+def tournament_command(args):
+    """Handle the tournament subcommand."""
+    policies = [name.strip() for name in args.policies.split(",") if name.strip()]
+    for name in policies:
+        if name not in POLICIES:
+            raise SystemExit(f"Unknown policy: {name} (expected one of {', '.join(POLICIES)})")
+    if not MIN_GRID_SIZE <= args.size <= MAX_GRID_SIZE:
+        raise SystemExit(f"Board size must be from {MIN_GRID_SIZE} to {MAX_GRID_SIZE}")
+    if "expectimax" in policies and args.size != 4:
+        raise SystemExit("The expectimax policy only plays 4x4 boards "
+                         "(pass --policies random,greedy for other sizes)")
+    # Game i uses seed + i, and every seed must fit a replay
+    last_seed = MAX_SEED - max(args.games - 1, 0)
+    if not 0 <= args.seed <= last_seed:
+        raise SystemExit(f"The seed must be from 0 to {last_seed}")
+
+    start = time.perf_counter()
+    results = run_tournament(
+        policies,
+        args.games,
+        seed=args.seed,
+        workers=args.workers,
+        size=args.size,
+        depth=args.depth,
+        time_limit=args.time_limit,
+        max_moves=args.max_moves,
+    )
+    elapsed = time.perf_counter() - start
+
+    summary = summarize(results)
+    print_summary(summary)
+    total_moves = sum(result["moves"] for result in results)
+    print(f"\n{len(results)} games, {total_moves} moves in {elapsed:.2f}s "
+          f"({total_moves / elapsed:.0f} moves/sec overall)")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"summary": summary, "games": results}, f, indent=2)
+
+
+def build_parser():
+    """Create the command line parser."""
+    parser = argparse.ArgumentParser(description="Kids 2048 benchmarks")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    tournament = subcommands.add_parser("tournament", help="Play many games per AI policy")
+    tournament.add_argument("--policies", default=",".join(POLICIES),
+                            help="Comma-separated policies to compare")
+    tournament.add_argument("--games", type=int, default=100, help="Games per policy")
+    tournament.add_argument("--seed", type=int, default=0, help="Seed of the first game")
+    tournament.add_argument("--workers", type=int, default=None,
+                            help="Worker processes (defaults to the CPU count)")
+    tournament.add_argument("--size", type=int, default=4, help="Board size")
+    tournament.add_argument("--depth", type=int, default=2, help="Expectimax search depth")
+    tournament.add_argument("--time-limit", type=float, default=None,
+                            help="Expectimax time budget per move in seconds (not reproducible)")
+    tournament.add_argument("--max-moves", type=int, default=None, help="Stop each game after this many moves")
+    tournament.add_argument("--json", help="Also write per-game results and the summary to this file")
+    tournament.set_defaults(func=tournament_command)
+    return parser
+
+
+def main(argv=None):
+    """Run the benchmark command line."""
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Micro-benchmarks of the move engine: moves, moves_available and
+add_random_tile on GameBoard and PackedBoard across board sizes, plus the
+4x4 BitBoard.
+
+Each engine also reports move_per_cell, the average move time divided by
+the number of cells. It stays roughly flat across sizes when a move's cost
+grows linearly with the board.
+"""
+import random
+
+from benchmarks.timing import measure
+from utils.bitboard import BitBoard
+from utils.game_logic import GameBoard
+from utils.packed import PackedBoard
+
+SIZES = (3, 4, 5, 8, 12, 16)
+DIRECTIONS = ("left", "right", "up", "down")
+BOARDS_PER_ROUND = 2000
+
+
+def mid_game_grids(size, count, seed=0):
+    """Generate reproducible boards that look like the middle of a game.
+
+    Half of the cells hold small tiles, weighted towards low values the way
+    real games are, so moves exercise both sliding and merging.
+    """
+    rng = random.Random(seed)
+    values = (2, 2, 2, 4, 4, 8, 8, 16, 32, 64)
+    grids = []
+    for _ in range(count):
+        cells = [0] * (size * size)
+        for index in rng.sample(range(size * size), size * size // 2):
+            cells[index] = rng.choice(values)
+        grids.append([cells[row * size:(row + 1) * size] for row in range(size)])
+    return grids
+
+
+def _fresh_boards(board_class, grids):
+    """Build boards from grids for one timing round."""
+    boards = []
+    for grid in grids:
+        board = board_class(len(grid), rng=random.Random(0))
+        board.grid = [row[:] for row in grid]
+        boards.append(board)
+    return boards
+
+
+def _time_moves(board_class, grids, direction):
+    """Time one move per board."""
+    def run(boards):
+        for board in boards:
+            getattr(board, f"move_{direction}")()
+        return len(boards)
+    return measure(run, lambda: _fresh_boards(board_class, grids))
+
+
+def _time_moves_available(board_class, grids):
+    """Time moves_available on a fixed set of boards."""
+    boards = _fresh_boards(board_class, grids)
+
+    def run(_):
+        for board in boards:
+            board.moves_available()
+        return len(boards)
+    return measure(run)
+
+
+def _time_add_random_tile(board_class, grids):
+    """Time one spawn per board."""
+    def run(boards):
+        for board in boards:
+            board.add_random_tile()
+        return len(boards)
+    return measure(run, lambda: _fresh_boards(board_class, grids))
+
+
+def run_benchmarks():
+    """Run every engine micro-benchmark and return results by name."""
+    results = {}
+    for size in SIZES:
+        grids = mid_game_grids(size, BOARDS_PER_ROUND // size, seed=size)
+        engines = [("GameBoard", GameBoard), ("PackedBoard", PackedBoard)]
+        if size == 4:
+            engines.append(("BitBoard", BitBoard))
+
+        for name, board_class in engines:
+            prefix = f"engine.{name}[size={size}]"
+            moves = [_time_moves(board_class, grids, direction) for direction in DIRECTIONS]
+            for direction, result in zip(DIRECTIONS, moves):
+                results[f"{prefix}.move_{direction}"] = result
+            results[f"{prefix}.move_per_cell"] = {
+                "unit": "ns/cell",
+                "value": sum(result["value"] for result in moves) / len(moves) / (size * size),
+                "operations": sum(result["operations"] for result in moves),
+            }
+            results[f"{prefix}.moves_available"] = _time_moves_available(board_class, grids)
+            results[f"{prefix}.add_random_tile"] = _time_add_random_tile(board_class, grids)
+    return results
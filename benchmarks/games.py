@@ -0,0 +1,32 @@
+"""
+Macro-benchmarks: full games played headless with the simple AI policies.
+"""
+from utils.simulation import play_game
+
+GAMES = (
+    # (policy, size, games, max_moves) - large boards rarely end, so they are capped
+    ("random", 4, 20, None),
+    ("greedy", 4, 20, None),
+    ("random", 8, 5, 2000),
+)
+
+
+def run_benchmarks():
+    """Play fixed-seed games per policy and report the cost of each move."""
+    results = {}
+    for policy, size, games, max_moves in GAMES:
+        best = None
+        moves = 0
+        # The fastest of a few repetitions is the least noisy estimate
+        for _ in range(3):
+            total_ns = 0
+            moves = 0
+            for seed in range(games):
+                result = play_game(policy, seed, size=size, max_moves=max_moves)
+                total_ns += result["seconds"] * 1e9
+                moves += result["moves"]
+            per_move = total_ns / max(moves, 1)
+            if best is None or per_move < best:
+                best = per_move
+        results[f"games.{policy}[size={size}]"] = {"unit": "ns/op", "value": best, "operations": moves}
+    return results
@@ -0,0 +1,46 @@
+"""
+Headless render benchmarks of Game.draw_board and Game.draw_ui.
+
+Uses SDL's dummy video driver and draws onto an offscreen pygame.Surface,
+so it runs on machines without a display.
+"""
+import os
+import random
+
+from benchmarks.timing import measure
+
+FRAMES = 200
+
+
+def _make_game():
+    """Create a Game that renders offscreen, with a mid-game board."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    import pygame
+    from game import Game
+
+    game = Game(seed=0, data_path=None)
+    game.tutorial.show = False
+    game.screen = pygame.Surface((game.screen_width, game.screen_height))
+
+    rng = random.Random(0)
+    for _ in range(60):
+        game.move_tiles(rng.choice(("up", "down", "left", "right")))
+    game.stop_animations()
+    return game
+
+
+def run_benchmarks():
+    """Time drawing the board and the UI for a number of frames."""
+    game = _make_game()
+    results = {}
+    for name in ("draw_board", "draw_ui"):
+        draw = getattr(game, name)
+
+        def run(_):
+            for _ in range(FRAMES):
+                draw()
+            return FRAMES
+        results[f"render.{name}"] = measure(run)
+    return results
@@ -0,0 +1,131 @@
+"""
+Run the Kids 2048 benchmark suites and compare them against a baseline.
+
+Run from the repository root:
+
+    python -m benchmarks.run                      # all suites, compare to baseline
+    python -m benchmarks.run engine games         # selected suites
+    python -m benchmarks.run --update-baseline    # store the results as the new baseline
+
+Results are written as JSON with a stable schema:
+
+    {
+      "schema_version": 1,
+      "metadata": {"python": ..., "platform": ..., "timestamp": ...},
+      "benchmarks": {
+        "<suite>.<name>": {"unit": "ns/op", "value": <float>, "operations": <int>}
+      }
+    }
+
+Every value is a time per operation (or per cell, for the engine's
+move_per_cell), so lower is always better. The run
+exits with status 1 when any benchmark is slower than the baseline by more
+than the threshold.
+"""
+import argparse
+import importlib
+import json
+import os
+import platform
+import sys
+import time
+
+SCHEMA_VERSION = 1
+SUITES = ("engine", "games", "render", "sound")
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(BENCHMARK_DIR, "baseline.json")
+
+
+def run_suites(suites):
+    """Run the named suites and return the results document."""
+    benchmarks = {}
+    for suite in suites:
+        module = importlib.import_module(f"benchmarks.{suite}")
+        print(f"Running {suite} benchmarks...", file=sys.stderr)
+        benchmarks.update(module.run_benchmarks())
+
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "metadata": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "benchmarks": dict(sorted(benchmarks.items())),
+    }
+
+
+def compare(results, baseline, threshold):
+    """Compare results against a baseline document.
+
+    Returns a list of (name, baseline_value, value, ratio) rows and the
+    names of benchmarks that regressed by more than threshold (0.25 = 25%).
+    """
+    rows = []
+    regressions = []
+    for name, result in results["benchmarks"].items():
+        previous = baseline.get("benchmarks", {}).get(name)
+        if previous is None or previous["unit"] != result["unit"] or not previous["value"]:
+            rows.append((name, None, result["value"], None))
+            continue
+        ratio = result["value"] / previous["value"]
+        rows.append((name, previous["value"], result["value"], ratio))
+        if ratio > 1 + threshold:
+            regressions.append(name)
+    return rows, regressions
+
+
+def print_comparison(rows, regressions):
+    """Print the comparison as a plain text table."""
+    print(f"{'benchmark':<48}{'baseline':>14}{'current':>14}{'change':>10}")
+    for name, previous, value, ratio in rows:
+        previous_text = f"{previous:,.0f}" if previous is not None else "-"
+        change_text = f"{(ratio - 1) * 100:+.1f}%" if ratio is not None else "new"
+        marker = "  REGRESSION" if name in regressions else ""
+        print(f"{name:<48}{previous_text:>14}{value:>14,.0f}{change_text:>10}{marker}")
+
+
+def main(argv=None):
+    """Run the benchmark command line."""
+    parser = argparse.ArgumentParser(description="Kids 2048 benchmark suite")
+    parser.add_argument("suites", nargs="*", help=f"Suites to run: {', '.join(SUITES)} (default: all)")
+    parser.add_argument("--output", help="Write the results JSON to this file")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed slowdown before a benchmark counts as a regression")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Store these results as the new baseline instead of comparing")
+    args = parser.parse_args(argv)
+    for suite in args.suites:
+        if suite not in SUITES:
+            parser.error(f"unknown suite {suite!r} (expected one of {', '.join(SUITES)})")
+
+    results = run_suites(args.suites or SUITES)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    try:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        baseline = {}
+
+    rows, regressions = compare(results, baseline, args.threshold)
+    print_comparison(rows, regressions)
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
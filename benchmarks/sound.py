@@ -0,0 +1,38 @@
+"""
+Benchmarks of the sound manager's bookkeeping, using the silent backend.
+"""
+from benchmarks.timing import measure
+from utils.sound import NullBackend, SoundManager
+
+PLAYS = 10000
+
+
+def run_benchmarks():
+    """Time playing cues, with and without the rate limit kicking in."""
+    results = {}
+
+    def setup():
+        return SoundManager(NullBackend())
+
+    def play_unthrottled(sounds):
+        # A clock that jumps past every interval, so each play goes through
+        now = [0.0]
+
+        def clock():
+            now[0] += 1.0
+            return now[0]
+        sounds.clock = clock
+        for _ in range(PLAYS):
+            sounds.play("merge")
+        return PLAYS
+
+    def play_throttled(sounds):
+        # A frozen clock, so all but the first play are throttled
+        sounds.clock = lambda: 0.0
+        for _ in range(PLAYS):
+            sounds.play("merge")
+        return PLAYS
+
+    results["sound.play"] = measure(play_unthrottled, setup)
+    results["sound.play[throttled]"] = measure(play_throttled, setup)
+    return results
@@ -0,0 +1,32 @@
+"""
+Timing helpers shared by the benchmark suites.
+"""
+import gc
+import time
+
+
+def measure(run, setup=None, rounds=5):
+    """Time a batch of operations and return the best nanoseconds per operation.
+
+    setup is called before each round (untimed) and its result is passed to
+    run, which performs the operations and returns how many it did. The
+    fastest round is reported, which is the least noisy estimate. The
+    garbage collector is paused while timing, as timeit does.
+    """
+    best = None
+    operations = 0
+    for _ in range(rounds):
+        state = setup() if setup is not None else None
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            start = time.perf_counter_ns()
+            operations = run(state)
+            elapsed = time.perf_counter_ns() - start
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        per_op = elapsed / max(operations, 1)
+        if best is None or per_op < best:
+            best = per_op
+    return {"unit": "ns/op", "value": best, "operations": operations}
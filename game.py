@@ -2,21 +2,67 @@
 """
 Kids 2048 Game - A colorful, kid-friendly version of the classic 2048 game.
 """
-import os
 import pygame
 import sys
 import random
-import json
-from utils.constants import COLORS
+from utils.constants import COLORS, MAX_GRID_SIZE, MIN_GRID_SIZE
+from utils.animations import AnimationManager
+from utils.assets import AssetManager
+from utils.game_logic import GameBoard
+from utils.history import History
+from utils.packed import pack_grid, unpack_grid
+from utils.persistence import Autosaver, load_json
+from utils.profiler import FrameProfiler
+from utils.render_cache import RenderCache
+from utils.replay import ReplayWriter, board_tiles
 from utils.settings import Settings
+from utils.sound import MixerBackend, NullBackend, SoundManager
 from utils.tutorial import Tutorial
 
+# Where the best score, settings and the game in progress are saved
+GAME_DATA_PATH = "game_data.json"
+
+# How long the main loop sleeps waiting for input before checking in again
+IDLE_WAIT_MS = 500
+
+# Animation timings in milliseconds: tiles slide, then merged tiles pop
+SLIDE_MS = 100
+MERGE_MS = 120
+
+# Longest frame time fed to the animations, so a stall doesn't skip them
+MAX_FRAME_MS = 33
+
+# Window size the layout is designed for; other sizes scale it to fit
+BASE_WIDTH = 800
+BASE_HEIGHT = 760
+
+# The UI scale is rounded down to these steps, so fonts and tiles are only
+# rebuilt when a resize crosses one
+SCALE_STEP = 0.125
+
 
 class Game:
     """Main game class that handles the game logic and rendering."""
     
-    def __init__(self):
-        """Initialize the game."""
+    def __init__(self, seed=None, profile_path=None, replay_path=None, data_path=GAME_DATA_PATH, size=4):
+        """Initialize the game.
+        
+        size is the number of cells along each side of the board, from
+        MIN_GRID_SIZE to MAX_GRID_SIZE. seed makes the sequence of games reproducible: every new game draws
+        its own seed from it, and that seed alone replays the game's spawns.
+        With profile_path, the timings of every frame are recorded from the
+        start and written there as each frame finishes. With replay_path, every game is appended to
+        that replay file. The best score, settings and the game in progress
+        are saved to data_path, and the saved game is resumed at launch
+        unless a seed is given or it was played on another board size. A
+        data_path of None turns saving off.
+        """
+        if not MIN_GRID_SIZE <= size <= MAX_GRID_SIZE:
+            raise ValueError(f"board size must be from {MIN_GRID_SIZE} to {MAX_GRID_SIZE}")
+        
+        # Fonts, images and sounds, which also times the startup
+        self.assets = AssetManager()
+        
         # Initialize pygame
         pygame.init()
         
@@ -26,9 +72,16 @@ class Game:
         self.show_settings = False
         
         # Create screen
-        self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
+        self.screen = pygame.display.set_mode((self.screen_width, self.screen_height), pygame.RESIZABLE)
         pygame.display.set_caption("Kids 2048")
         
+        # Sound cues, played from the sounds the asset manager decodes in
+        # the background, and silent without an audio device
+        if pygame.mixer.get_init() is not None:
+            self.sounds = SoundManager(MixerBackend(self.assets.sounds))
+        else:
+            self.sounds = SoundManager(NullBackend())
+        
         # Initialize settings
         self.settings = Settings()
         
@@ -36,74 +89,170 @@ class Game:
         self.tutorial = Tutorial(self)
         
         # Game board setup
-        self.grid_size = 4
-        self.cell_size = 100
-        self.grid_padding = 15
-        self.board_width = self.grid_size * self.cell_size + (self.grid_size + 1) * self.grid_padding
-        self.board_height = self.board_width
-        self.board_x = (self.screen_width - self.board_width) // 2
+        self.grid_size = size
         
-        # Increase the vertical position of the board to create more space above
-        self.board_y = (self.screen_height - self.board_height) // 2 + 140
+        # Prebuilt tile and label surfaces, rebuilt when the theme changes
+        self.render_cache = RenderCache()
         
-        # Score tracking
-        self.score = 0
-        self.highest_score = self.load_highest_score()
+        # Fonts and settings icons, cached per pixel size
+        self.fonts = {}
+        self.settings_icons = {}
+        self.load_settings_icon()
         
-        # Initialize the game grid
-        self.grid = [[0 for _ in range(self.grid_size)] for _ in range(self.grid_size)]
+        # Position everything for the window size
+        self.layout()
         
-        # Add initial tiles
-        self.add_random_tile()
-        self.add_random_tile()
+        # Score tracking and saved data
+        self.score = 0
+        self.data_path = data_path
+        saved = self.load_game_data()
+        self.highest_score = saved.get("highest_score", 0)
+        self.settings.dark_mode = saved.get("settings", {}).get("dark_mode", False)
+        
+        # Saves are written in the background, at most once a second
+        self.autosaver = Autosaver(data_path) if data_path is not None else None
+        
+        # Tile animations, and the cells they cover until they finish
+        self.animations = AnimationManager()
+        self.animating_cells = set()
+        self.board_stale = False
+        
+        # Replay log of every game played
+        self.replay = None
+        if replay_path is not None:
+            try:
+                self.replay = ReplayWriter(replay_path)
+            except (OSError, ValueError) as error:
+                print(f"Not recording replays: {error}")
+        
+        # Moves that can be undone and redone in the current game
+        self.history = History()
+        
+        # Resume the saved game, or initialize the game board (adds the
+        # initial tiles). A seed asks for reproducible games, so it starts fresh.
+        self.seed_rng = random.Random(seed)
+        if seed is not None or not self.resume_game(saved.get("game")):
+            self.new_board()
+        
+        # What was last drawn, used to redraw only the regions that change
+        self.needs_full_redraw = True
+        self.dirty_cells = set()
+        self._animation_rects = []
+        self._overlay_rect = None
+        self._drawn_scores = None
+        self._drawn_ui_state = None
+        
+        # Frame-time profiler, toggled with F3 or enabled from the start
+        self.profile_path = profile_path
+        self.profiler = FrameProfiler()
+        for target, name, label in (
+            (self, "handle_input", "handle_input"),
+            (self, "draw_board", "draw_board"),
+            (self, "draw_ui", "draw_ui"),
+            (self, "draw_settings", "draw_settings"),
+            (self.tutorial, "draw", "Tutorial.draw"),
+            (self, "present", "display.flip"),
+        ):
+            self.profiler.instrument(target, name, label)
+        if profile_path is not None:
+            self.profiler.enable()
+            self.profiler.record(profile_path)
         
-        # Load font
+        # Always show tutorial at startup
+        self.tutorial.show = True
+    
+    def scaled(self, value):
+        """Scale a length of the base layout to the current window."""
+        return round(value * self.ui_scale)
+    
+    def layout(self):
+        """Position everything for the current window size and grid size.
+        
+        The base layout is scaled to fit the window, keeping its proportions.
+        The board keeps the size of a 4x4 board, so larger grids get smaller
+        cells.
+        """
+        scale = min(self.screen_width / BASE_WIDTH, self.screen_height / BASE_HEIGHT)
+        self.ui_scale = max(SCALE_STEP, int(scale / SCALE_STEP) * SCALE_STEP)
+        
+        board_size = self.scaled(4 * 100 + 5 * 15)
+        self.grid_padding = max(1, round(15 * self.ui_scale * 4 / self.grid_size))
+        self.cell_size = (board_size - (self.grid_size + 1) * self.grid_padding) // self.grid_size
+        self.board_width = self.grid_size * self.cell_size + (self.grid_size + 1) * self.grid_padding
+        self.board_height = self.board_width
+        self.board_x = (self.screen_width - self.board_width) // 2
+        
+        # The title and score boxes sit above the board and the restart
+        # button below it, and the whole block is centered vertically
+        header = self.scaled(185)
+        footer = self.scaled(100)
+        self.board_y = (self.screen_height - header - self.board_height - footer) // 2 + header
+        self.layout_cells()
         self.load_fonts()
-            
-        # Load or create settings icon
-        self.load_settings_icon()
-            
-        # Button areas - Repositioned as requested
-        self.restart_button_width = 150
-        self.restart_button_height = 50
+        
+        # Restart button directly below the tiles
+        self.restart_button_width = self.scaled(150)
+        self.restart_button_height = self.scaled(50)
         self.restart_button_rect = pygame.Rect(
             self.board_x + (self.board_width - self.restart_button_width) // 2,  # Center horizontally
-            self.board_y + self.board_height + 20,  # Directly below the tiles with less spacing
-            self.restart_button_width, 
+            self.board_y + self.board_height + self.scaled(20),
+            self.restart_button_width,
             self.restart_button_height
         )
         
-        # Settings button in top right corner
+        # Settings button in top right corner, aligned with the "KIDS 2048" heading
+        icon_size = self.scaled(40)
+        self.settings_icon = self.scaled_settings_icon(icon_size)
         self.settings_button_rect = pygame.Rect(
-            self.board_x + self.board_width - 50, 
-            self.board_y - 60, 
-            40, 
-            40
+            self.board_x + self.board_width - self.scaled(50),  # Aligned with right edge of tile grid
+            self.board_y - self.scaled(150),
+            icon_size,
+            icon_size
         )
-        
-        # Always show tutorial at startup
-        self.tutorial.show = True
+    
+    def resize(self, width, height):
+        """Lay the game out again for a new window size."""
+        self.screen_width = width
+        self.screen_height = height
+        self.screen = pygame.display.set_mode((width, height), pygame.RESIZABLE)
+        self.layout()
+        
+        # Positions changed, so running animations and the static layer are stale
+        self.stop_animations()
+        self.render_cache.discard("layer")
+        self.needs_full_redraw = True
+    
+    def get_font(self, size):
+        """Return the game font at a pixel size, loading it on first use."""
+        font = self.fonts.get(size)
+        if font is None:
+            font = self.fonts[size] = self.assets.font(size)
+        return font
     
     def load_fonts(self):
-        """Load game fonts."""
-        try:
-            self.font = pygame.font.Font(os.path.join("assets", "fonts", "fredoka.ttf"), 36)
-            self.small_font = pygame.font.Font(os.path.join("assets", "fonts", "fredoka.ttf"), 24)
-            self.large_font = pygame.font.Font(os.path.join("assets", "fonts", "fredoka.ttf"), 48)
-        except (FileNotFoundError, pygame.error):
-            print("Font not found, using system font")
-            self.font = pygame.font.SysFont(None, 36)
-            self.small_font = pygame.font.SysFont(None, 24)
-            self.large_font = pygame.font.SysFont(None, 48)
+        """Load game fonts for the current UI scale and cell size."""
+        self.font = self.get_font(self.scaled(36))
+        self.small_font = self.get_font(self.scaled(24))
+        self.large_font = self.get_font(self.scaled(48))
+        
+        # Tile values follow the cell size, which also depends on the grid size
+        self.tile_font = self.get_font(max(1, round(self.cell_size * 0.36)))
+        self.tile_small_font = self.get_font(max(1, round(self.cell_size * 0.24)))
     
     def load_settings_icon(self):
         """Load or create settings icon."""
-        try:
-            self.settings_icon = pygame.image.load(os.path.join("assets", "images", "settings.png"))
-            self.settings_icon = pygame.transform.scale(self.settings_icon, (40, 40))
-        except (FileNotFoundError, pygame.error):
+        self.settings_icon_image = self.assets.image("settings")
+        if self.settings_icon_image is None:
             # Create a simple gear icon if image not found
-            self.settings_icon = self.create_settings_icon()
+            self.settings_icon_image = self.create_settings_icon()
+    
+    def scaled_settings_icon(self, size):
+        """Return the settings icon scaled to size, caching each size."""
+        icon = self.settings_icons.get(size)
+        if icon is None:
+            icon = pygame.transform.smoothscale(self.settings_icon_image.convert_alpha(), (size, size))
+            self.settings_icons[size] = icon
+        return icon
     
     def create_settings_icon(self):
         """Create a simple gear icon surface."""
@@ -121,142 +270,318 @@ class Game:
         """Check if this is the first time running the game - always return True to show tutorial."""
         return True
     
-    def save_game_data(self):
-        """Save game data to file."""
-        data = {
+    def game_data(self):
+        """Everything saved between sessions, including the game in progress."""
+        return {
             "highest_score": self.highest_score,
-            "first_run": False
+            "first_run": False,
+            "settings": {"dark_mode": self.settings.dark_mode},
+            "game": {
+                "size": self.grid_size,
+                "grid": [row[:] for row in self.grid],
+                "score": self.score,
+                "won": self.won,
+                "seed": self.game_seed,
+                "rng": self.board.rng.getstate(),
+                "seed_rng": self.seed_rng.getstate(),
+            },
         }
-        with open("game_data.json", "w") as f:
-            json.dump(data, f)
     
-    def load_highest_score(self):
-        """Load highest score from file."""
+    def autosave(self):
+        """Save game data in the background, batching saves made close together."""
+        if self.autosaver is not None:
+            self.autosaver.save(self.game_data())
+    
+    def save_game_data(self):
+        """Save game data to file now."""
+        if self.autosaver is not None:
+            self.autosaver.save(self.game_data())
+            self.autosaver.flush()
+    
+    def load_game_data(self):
+        """Load saved game data, or an empty dict if there is none."""
+        data = load_json(self.data_path) if self.data_path is not None else None
+        return data if isinstance(data, dict) else {}
+    
+    def resume_game(self, state):
+        """Restore a saved game, returning False if there is none to restore."""
         try:
-            with open("game_data.json", "r") as f:
-                data = json.load(f)
-                return data.get("highest_score", 0)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return 0
+            size = state["size"]
+            grid = [[int(value) for value in row] for row in state["grid"]]
+            if size != self.grid_size or len(grid) != size or any(len(row) != size for row in grid):
+                return False
+            rng_state = state["rng"]
+            seed_rng_state = state["seed_rng"]
+            rng = random.Random()
+            rng.setstate((rng_state[0], tuple(rng_state[1]), rng_state[2]))
+            self.seed_rng.setstate((seed_rng_state[0], tuple(seed_rng_state[1]), seed_rng_state[2]))
+            score = int(state["score"])
+            game_seed = state["seed"]
+        except (KeyError, IndexError, TypeError, ValueError):
+            return False
+        
+        # The board spawns its initial tiles on creation, so its generator
+        # state is restored after the saved grid replaces them
+        board = GameBoard(size, rng=rng)
+        board.grid = grid
+        rng.setstate((rng_state[0], tuple(rng_state[1]), rng_state[2]))
+        
+        self.score = score
+        self.game_seed = game_seed
+        self.start_board(board)
+        self.won = bool(state.get("won", False))
+        return True
+    
+    @property
+    def grid(self):
+        """The tile values of the current board."""
+        return self.board.grid
+    
+    @grid.setter
+    def grid(self, grid):
+        self.board.grid = grid
+        self.board_stale = True
     
     def add_random_tile(self):
         """Add a random tile (2 or 4) to an empty cell."""
-        empty_cells = [(i, j) for i in range(self.grid_size) for j in range(self.grid_size) if self.grid[i][j] == 0]
-        if empty_cells:
-            i, j = random.choice(empty_cells)
-            self.grid[i][j] = 2 if random.random() < 0.9 else 4
+        return self.board.add_random_tile()
     
-    def draw_board(self):
-        """Draw the game board with tiles."""
-        theme = "dark" if self.settings.dark_mode else "light"
+    def tile_surface(self, value, theme, scale=1.0):
+        """Return the cached surface for a tile, building it on first use.
+        
+        Scaled tiles, used by the merge animation, are cached per scale
+        rounded to a few steps so an animation only builds a handful of them.
+        """
+        scale = round(scale * 20) / 20
+        key = ("tile", value, theme, self.cell_size, scale)
+        surface = self.render_cache.get(key)
+        if surface is not None:
+            return surface
+        
+        if scale != 1.0:
+            size = round(self.cell_size * scale)
+            surface = pygame.transform.smoothscale(self.tile_surface(value, theme), (size, size))
+            return self.render_cache.put(key, surface)
+        
         colors = COLORS[theme]
         
-        # Draw the board background
+        # Determine tile color
+        if value <= 2048:
+            tile_color = colors[f"tile_{value}"]
+        else:
+            tile_color = colors["tile_super"]
+        
+        # Bake the rounded tile and its centered value into one surface
+        surface = pygame.Surface((self.cell_size, self.cell_size), pygame.SRCALPHA)
         pygame.draw.rect(
-            self.screen, 
-            colors["grid_background"],
-            (self.board_x, self.board_y, self.board_width, self.board_height),
-            border_radius=10
+            surface,
+            tile_color,
+            (0, 0, self.cell_size, self.cell_size),
+            border_radius=self.scaled(5)
         )
-        
-        # Draw cells and tiles
-        for i in range(self.grid_size):
-            for j in range(self.grid_size):
-                cell_x = self.board_x + self.grid_padding * (j + 1) + self.cell_size * j
-                cell_y = self.board_y + self.grid_padding * (i + 1) + self.cell_size * i
-                
-                # Draw empty cell
-                pygame.draw.rect(
-                    self.screen,
-                    colors["empty_cell"],
-                    (cell_x, cell_y, self.cell_size, self.cell_size),
-                    border_radius=5
+        text_color = colors["text"] if value < 8 else colors["button_text"]
+        font_size = self.tile_font if value < 1000 else self.tile_small_font
+        text_surface = font_size.render(str(value), True, text_color)
+        
+        # Long numbers on small cells are shrunk to fit inside the tile
+        max_width = self.cell_size - 2 * self.grid_padding
+        if text_surface.get_width() > max_width > 0:
+            height = max(1, text_surface.get_height() * max_width // text_surface.get_width())
+            text_surface = pygame.transform.smoothscale(text_surface, (max_width, height))
+        text_rect = text_surface.get_rect(center=(self.cell_size // 2, self.cell_size // 2))
+        surface.blit(text_surface, text_rect)
+        return self.render_cache.put(key, surface.convert_alpha())
+    
+    def render_text(self, font, text, color):
+        """Render text through the render cache."""
+        key = ("text", font, text, color)
+        surface = self.render_cache.get(key)
+        if surface is None:
+            surface = self.render_cache.put(key, font.render(text, True, color))
+        return surface
+    
+    def layout_cells(self):
+        """Compute the screen rectangle of the board and of every cell."""
+        self.board_rect = pygame.Rect(self.board_x, self.board_y, self.board_width, self.board_height)
+        self.cell_rects = [
+            [
+                pygame.Rect(
+                    self.board_x + self.grid_padding * (col + 1) + self.cell_size * col,
+                    self.board_y + self.grid_padding * (row + 1) + self.cell_size * row,
+                    self.cell_size,
+                    self.cell_size
                 )
-                
-                # Draw tile if not empty
-                if self.grid[i][j] != 0:
-                    value = self.grid[i][j]
-                    
-                    # Determine tile color
-                    if value <= 2048:
-                        tile_color = colors[f"tile_{value}"]
-                    else:
-                        tile_color = colors["tile_super"]
-                    
-                    # Draw tile
-                    pygame.draw.rect(
-                        self.screen,
-                        tile_color,
-                        (cell_x, cell_y, self.cell_size, self.cell_size),
-                        border_radius=5
-                    )
-                    
-                    # Draw value text
-                    text_color = colors["text"] if value < 8 else colors["button_text"]
-                    font_size = self.font if value < 1000 else self.small_font
-                    text_surface = font_size.render(str(value), True, text_color)
-                    text_rect = text_surface.get_rect(center=(cell_x + self.cell_size // 2, cell_y + self.cell_size // 2))
-                    self.screen.blit(text_surface, text_rect)
+                for col in range(self.grid_size)
+            ]
+            for row in range(self.grid_size)
+        ]
+        self.cell_rect_list = [rect for rects in self.cell_rects for rect in rects]
     
-    def draw_ui(self):
-        """Draw UI elements like score and buttons."""
-        theme = "dark" if self.settings.dark_mode else "light"
-        colors = COLORS[theme]
-        
-        # Draw game title - moved higher for better positioning
-        title_text = self.large_font.render("Kids 2048", True, colors["text"])
-        title_rect = title_text.get_rect(center=(self.board_x + self.board_width // 2, self.board_y - 150))
-        self.screen.blit(title_text, title_rect)
-        
-        # Draw score boxes - Moved below the heading with increased spacing from tiles
-        score_box_width = 150
-        score_box_height = 70
-        score_box_padding = 20
+    def score_box_rects(self):
+        """Rectangles of the SCORE and BEST boxes."""
+        score_box_width = self.scaled(150)
+        score_box_height = self.scaled(70)
+        
+        # Both boxes sit below the heading, with more space from the tiles
+        score_box_y = self.board_y - self.scaled(80)
+        return (
+            pygame.Rect(self.board_x, score_box_y, score_box_width, score_box_height),
+            pygame.Rect(self.board_x + self.board_width - score_box_width, score_box_y, score_box_width, score_box_height),
+        )
+    
+    def build_static_layer(self, theme):
+        """Composite everything that never changes between moves into one surface.
         
-        # Current score box - positioned below the heading on the left with more space from tiles
-        score_box_x = self.board_x
-        score_box_y = self.board_y - 80  # Maintained spacing between score and tiles
+        That is the screen background, the settings button, the board with its
+        empty cells, the score box frames and labels, the title and the
+        restart button. Tiles and score values are drawn on top of it.
+        """
+        colors = COLORS[theme]
+        layer = pygame.Surface((self.screen_width, self.screen_height)).convert()
+        layer.fill(colors["background"])
         
+        # Settings icon aligned with the "KIDS 2048" heading
         pygame.draw.rect(
-            self.screen,
-            colors["grid_background"],
-            (score_box_x, score_box_y, score_box_width, score_box_height),
-            border_radius=5
+            layer,
+            colors["button"],
+            self.settings_button_rect,
+            border_radius=self.scaled(5)
         )
-        score_label = self.small_font.render("SCORE", True, colors["text"])
-        score_value = self.font.render(str(self.score), True, colors["text"])
-        score_label_rect = score_label.get_rect(center=(score_box_x + score_box_width // 2, score_box_y + 20))
-        score_value_rect = score_value.get_rect(center=(score_box_x + score_box_width // 2, score_box_y + 45))
-        self.screen.blit(score_label, score_label_rect)
-        self.screen.blit(score_value, score_value_rect)
-        
-        # Highest score box - positioned below the heading on the right with more space from tiles
-        best_box_x = self.board_x + self.board_width - score_box_width
-        best_box_y = self.board_y - 80  # Maintained spacing between score and tiles
+        layer.blit(self.settings_icon, self.settings_button_rect.topleft)
         
+        # Board background and empty cells
         pygame.draw.rect(
-            self.screen,
+            layer,
             colors["grid_background"],
-            (best_box_x, best_box_y, score_box_width, score_box_height),
-            border_radius=5
+            self.board_rect,
+            border_radius=self.scaled(10)
         )
-        highest_label = self.small_font.render("BEST", True, colors["text"])
-        highest_value = self.font.render(str(self.highest_score), True, colors["text"])
-        highest_label_rect = highest_label.get_rect(center=(best_box_x + score_box_width // 2, best_box_y + 20))
-        highest_value_rect = highest_value.get_rect(center=(best_box_x + score_box_width // 2, best_box_y + 45))
-        self.screen.blit(highest_label, highest_label_rect)
-        self.screen.blit(highest_value, highest_value_rect)
-        
-        # Draw restart button - now below the board and centered
+        for row in self.cell_rects:
+            for rect in row:
+                pygame.draw.rect(
+                    layer,
+                    colors["empty_cell"],
+                    rect,
+                    border_radius=self.scaled(5)
+                )
+        
+        # Game title - moved higher for better positioning
+        title_text = self.large_font.render("Kids 2048", True, colors["text"])
+        title_rect = title_text.get_rect(center=(self.board_x + self.board_width // 2, self.board_y - self.scaled(150)))
+        layer.blit(title_text, title_rect)
+        
+        # Score box frames and their labels
+        for rect, label in zip(self.score_box_rects(), ("SCORE", "BEST")):
+            pygame.draw.rect(
+                layer,
+                colors["grid_background"],
+                rect,
+                border_radius=self.scaled(5)
+            )
+            label_text = self.small_font.render(label, True, colors["text"])
+            layer.blit(label_text, label_text.get_rect(center=(rect.centerx, rect.y + self.scaled(20))))
+        
+        # Restart button - below the board and centered
         pygame.draw.rect(
-            self.screen,
+            layer,
             colors["button"],
             self.restart_button_rect,
-            border_radius=5
+            border_radius=self.scaled(5)
         )
         restart_text = self.font.render("Restart", True, colors["button_text"])
         restart_text_rect = restart_text.get_rect(center=self.restart_button_rect.center)
-        self.screen.blit(restart_text, restart_text_rect)
+        layer.blit(restart_text, restart_text_rect)
+        return layer
+    
+    def static_layer(self, theme):
+        """Return the cached static layer for a theme."""
+        key = ("layer", theme, self.screen_width, self.screen_height)
+        layer = self.render_cache.get(key)
+        if layer is None:
+            layer = self.render_cache.put(key, self.build_static_layer(theme))
+        return layer
+    
+    def draw_cell(self, row, col, theme):
+        """Redraw one cell and its tile on its own, returning the rectangle drawn.
+        
+        A cell covered by a running animation is left empty for the animation.
+        """
+        rect = self.cell_rects[row][col]
+        self.screen.blit(self.static_layer(theme), rect, rect)
+        
+        value = self.board.grid[row][col]
+        if value != 0 and (row, col) not in self.animating_cells:
+            self.screen.blit(self.tile_surface(value, theme), rect)
+        return rect
+    
+    def draw_animations(self, theme):
+        """Draw the running animations, remembering where they were drawn."""
+        if self.animations.is_animating():
+            self._animation_rects = self.animations.draw(
+                self.screen,
+                lambda value, scale: self.tile_surface(value, theme, scale),
+                self.cell_size
+            )
+        else:
+            self._animation_rects = []
+        return self._animation_rects
+    
+    def draw_board_changes(self, theme):
+        """Redraw only what changed on the board, returning the rectangles drawn.
+        
+        The areas last frame's animations were drawn over are restored from
+        the static layer along with the cells they overlapped, then the
+        changed cells and this frame's animations are drawn.
+        """
+        static = self.static_layer(theme)
+        previous = self._animation_rects
+        cells = set(self.dirty_cells)
+        for rect in previous:
+            self.screen.blit(static, rect, rect)
+            for index in rect.collidelistall(self.cell_rect_list):
+                cells.add(divmod(index, self.grid_size))
+        
+        rects = [self.draw_cell(row, col, theme) for row, col in cells]
+        return previous + rects + self.draw_animations(theme)
+    
+    def draw_tiles(self, theme):
+        """Draw every tile over the board, assuming the empty board is already drawn.
+        
+        Cells covered by a running animation are left to the animation.
+        """
+        hidden = self.animating_cells
+        tiles = []
+        for i, (values, rects) in enumerate(zip(self.board.grid, self.cell_rects)):
+            for j, (value, rect) in enumerate(zip(values, rects)):
+                if value != 0 and (i, j) not in hidden:
+                    tiles.append((self.tile_surface(value, theme), rect))
+        self.screen.blits(tiles, doreturn=False)
+        self.draw_animations(theme)
+    
+    def draw_board(self):
+        """Draw the game board with tiles."""
+        theme = "dark" if self.settings.dark_mode else "light"
+        self.render_cache.set_theme(theme)
+        
+        # The board background and empty cells come from the static layer
+        self.screen.blit(self.static_layer(theme), self.board_rect, self.board_rect)
+        self.draw_tiles(theme)
+    
+    def draw_ui(self):
+        """Draw UI elements like score and buttons, returning the rectangles drawn."""
+        theme = "dark" if self.settings.dark_mode else "light"
+        colors = COLORS[theme]
+        self.render_cache.set_theme(theme)
+        layer = self.static_layer(theme)
+        
+        # The title, buttons, box frames and labels come from the static layer,
+        # leaving only the score values to draw
+        rects = self.score_box_rects()
+        for rect, value in zip(rects, (self.score, self.highest_score)):
+            self.screen.blit(layer, rect, rect)
+            value_text = self.render_text(self.font, str(value), colors["text"])
+            self.screen.blit(value_text, value_text.get_rect(center=(rect.centerx, rect.y + self.scaled(45))))
+        return rects
     
     def draw_settings(self):
         """Draw settings menu."""
@@ -264,28 +589,28 @@ class Game:
         colors = COLORS[theme]
         
         # Draw settings panel (no overlay) - positioned slightly lower on screen
-        panel_width = 300
-        panel_height = 200
+        panel_width = self.scaled(300)
+        panel_height = self.scaled(200)
         panel_x = (self.screen_width - panel_width) // 2
-        panel_y = (self.screen_height - panel_height) // 2 + 30  # Moved 30 pixels lower
+        panel_y = (self.screen_height - panel_height) // 2 + self.scaled(30)  # Moved 30 pixels lower
         
         pygame.draw.rect(
             self.screen,
             colors["grid_background"],
             (panel_x, panel_y, panel_width, panel_height),
-            border_radius=10
+            border_radius=self.scaled(10)
         )
         
         # Draw settings title
         settings_text = self.font.render("Settings", True, colors["text"])
-        settings_rect = settings_text.get_rect(center=(panel_x + panel_width // 2, panel_y + 30))
+        settings_rect = settings_text.get_rect(center=(panel_x + panel_width // 2, panel_y + self.scaled(30)))
         self.screen.blit(settings_text, settings_rect)
         
         # Draw theme toggle switch
-        toggle_width = 60
-        toggle_height = 30
-        toggle_x = panel_x + panel_width // 2 - toggle_width // 2 + 30  # Moved right to make space for label
-        toggle_y = panel_y + 90
+        toggle_width = self.scaled(60)
+        toggle_height = self.scaled(30)
+        toggle_x = panel_x + panel_width // 2 - toggle_width // 2 + self.scaled(30)  # Moved right to make space for label
+        toggle_y = panel_y + self.scaled(90)
         
         # Draw toggle background
         toggle_bg_color = colors["button"] if self.settings.dark_mode else colors["empty_cell"]
@@ -293,13 +618,14 @@ class Game:
             self.screen,
             toggle_bg_color,
             (toggle_x, toggle_y, toggle_width, toggle_height),
-            border_radius=15
+            border_radius=self.scaled(15)
         )
         
         # Draw toggle knob
-        knob_size = toggle_height - 6
-        knob_x = toggle_x + toggle_width - knob_size - 3 if self.settings.dark_mode else toggle_x + 3
-        knob_y = toggle_y + 3
+        knob_inset = self.scaled(3)
+        knob_size = toggle_height - 2 * knob_inset
+        knob_x = toggle_x + toggle_width - knob_size - knob_inset if self.settings.dark_mode else toggle_x + knob_inset
+        knob_y = toggle_y + knob_inset
         pygame.draw.circle(
             self.screen,
             colors["button_text"],
@@ -309,21 +635,26 @@ class Game:
         
         # Draw theme labels with more padding
         theme_label = self.font.render("Theme:", True, colors["text"])
-        theme_label_rect = theme_label.get_rect(midright=(toggle_x - 15, toggle_y + toggle_height // 2))
+        theme_label_rect = theme_label.get_rect(midright=(toggle_x - self.scaled(15), toggle_y + toggle_height // 2))
         self.screen.blit(theme_label, theme_label_rect)
         
         mode_text = "Dark" if self.settings.dark_mode else "Light"
         mode_label = self.small_font.render(mode_text, True, colors["text"])
-        mode_label_rect = mode_label.get_rect(midleft=(toggle_x + toggle_width + 10, toggle_y + toggle_height // 2))
+        mode_label_rect = mode_label.get_rect(midleft=(toggle_x + toggle_width + self.scaled(10), toggle_y + toggle_height // 2))
         self.screen.blit(mode_label, mode_label_rect)
         
         # Draw close button
-        close_button_rect = pygame.Rect(panel_x + panel_width - 40, panel_y + 10, 30, 30)
+        close_button_rect = pygame.Rect(
+            panel_x + panel_width - self.scaled(40),
+            panel_y + self.scaled(10),
+            self.scaled(30),
+            self.scaled(30)
+        )
         pygame.draw.rect(
             self.screen,
             colors["button"],
             close_button_rect,
-            border_radius=15
+            border_radius=self.scaled(15)
         )
         
         # Draw X
@@ -335,14 +666,31 @@ class Game:
         self.theme_button_rect = pygame.Rect(toggle_x, toggle_y, toggle_width, toggle_height)
         self.close_button_rect = close_button_rect
     
-    def handle_input(self):
-        """Handle user input events."""
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                self.save_game_data()
+    def handle_input(self, events=None):
+        """Handle user input events, reading the event queue if none are given."""
+        if events is None:
+            events = pygame.event.get()
+        
+        for event in events:
+            if event.type in (pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED, pygame.VIDEOEXPOSE):
+                # The window contents may have been lost
+                self.needs_full_redraw = True
+            elif event.type == pygame.VIDEORESIZE:
+                self.resize(event.w, event.h)
+            elif event.type == pygame.QUIT:
+                if self.autosaver is not None:
+                    self.autosaver.save(self.game_data())
+                    self.autosaver.close()
+                if self.replay is not None:
+                    self.replay.end_game(self.score)
+                    self.replay.close()
+                self.profiler.close()
                 pygame.quit()
                 sys.exit()
             elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_F3:
+                    self.toggle_profiler()
+                
                 if event.key == pygame.K_ESCAPE:
                     if self.tutorial.show:
                         self.tutorial.show = False
@@ -359,6 +707,12 @@ class Game:
                         self.move_tiles("left")
                     elif event.key == pygame.K_RIGHT:
                         self.move_tiles("right")
+                    elif event.key == pygame.K_z and event.mod & pygame.KMOD_SHIFT:
+                        self.redo()
+                    elif event.key == pygame.K_z:
+                        self.undo()
+                    elif event.key == pygame.K_y:
+                        self.redo()
                 elif self.tutorial.show:
                     if event.key == pygame.K_RIGHT:
                         self.tutorial.next_slide()
@@ -380,6 +734,7 @@ class Game:
                 elif self.show_settings:
                     if self.theme_button_rect.collidepoint(mouse_pos):
                         self.settings.dark_mode = not self.settings.dark_mode
+                        self.autosave()
                     elif self.close_button_rect.collidepoint(mouse_pos):
                         self.show_settings = False
                 # Handle main UI clicks
@@ -389,213 +744,280 @@ class Game:
                     elif self.settings_button_rect.collidepoint(mouse_pos):
                         self.show_settings = True
     
+    def new_board(self):
+        """Start a fresh board with its own seeded tile generator."""
+        self.game_seed = self.seed_rng.getrandbits(32)
+        self.start_board(GameBoard(self.grid_size, rng=random.Random(self.game_seed)))
+    
+    def start_board(self, board):
+        """Make board the one being played."""
+        self.board = board
+        self.board.track_moves = True
+        self.won = False
+        self.history.clear()
+        if self.replay is not None:
+            self.replay.end_game(self.score)
+            self.replay.begin_game(self.game_seed, self.grid_size, board_tiles(self.board))
+        self.stop_animations()
+    
     def restart_game(self):
         """Reset the game to initial state."""
-        self.grid = [[0 for _ in range(self.grid_size)] for _ in range(self.grid_size)]
+        self.new_board()
         self.score = 0
-        self.add_random_tile()
-        self.add_random_tile()
+        self.autosave()
     
     def move_tiles(self, direction):
         """Move tiles in the specified direction and merge if possible."""
-        moved = False
-        
-        # Create a copy of the grid for comparison
-        old_grid = [row[:] for row in self.grid]
-        
-        if direction == "up":
-            moved = self._move_up()
-        elif direction == "down":
-            moved = self._move_down()
-        elif direction == "left":
-            moved = self._move_left()
-        elif direction == "right":
-            moved = self._move_right()
-        
-        # Check if the grid changed
+        move = getattr(self.board, f"move_{direction}", None)
+        if move is None:
+            return False
+        
+        # The board reports whether anything moved and the score gained, so
+        # there is no need to snapshot the grid for comparison. The packed
+        # snapshot is only for undo.
+        before = self.snapshot()
+        if self.replay is not None and not self.replay.in_game:
+            # An undo ended the recorded game, so record a new one from here
+            self.replay.begin_game(self.game_seed, self.grid_size, board_tiles(self.board))
+        moved = move()
         if moved:
+            self.history.record(before)
+            self.score += self.board.score_increment
+            self.start_animations()
             self.add_random_tile()
             
+            # The move's diff says which cells to redraw
+            self.dirty_cells.update(self.board.last_diff.changed_cells())
+            if self.replay is not None:
+                self.replay.record_move(direction, self.board.last_diff.spawn)
+            self.play_move_sound()
+            
             # Update highest score
             if self.score > self.highest_score:
                 self.highest_score = self.score
+            
+            self.autosave()
         
         return moved
     
-    def _move_up(self):
-        """Move tiles up and merge if possible."""
-        moved = False
-        old_grid = [row[:] for row in self.grid]
-        
-        for j in range(self.grid_size):
-            # Compact column (move all tiles up)
-            for i in range(1, self.grid_size):
-                if self.grid[i][j] != 0:
-                    k = i
-                    while k > 0 and self.grid[k-1][j] == 0:
-                        self.grid[k-1][j] = self.grid[k][j]
-                        self.grid[k][j] = 0
-                        k -= 1
-            
-            # Merge tiles
-            for i in range(self.grid_size - 1):
-                if self.grid[i][j] != 0 and self.grid[i][j] == self.grid[i+1][j]:
-                    self.grid[i][j] *= 2
-                    self.score += self.grid[i][j]
-                    self.grid[i+1][j] = 0
-            
-            # Compact again after merging
-            for i in range(1, self.grid_size):
-                if self.grid[i][j] != 0:
-                    k = i
-                    while k > 0 and self.grid[k-1][j] == 0:
-                        self.grid[k-1][j] = self.grid[k][j]
-                        self.grid[k][j] = 0
-                        k -= 1
-        
-        # Check if the grid changed
-        return self.grid != old_grid
-    
-    def _move_down(self):
-        """Move tiles down and merge if possible."""
-        moved = False
-        old_grid = [row[:] for row in self.grid]
-        
-        for j in range(self.grid_size):
-            # Compact column (move all tiles down)
-            for i in range(self.grid_size - 2, -1, -1):
-                if self.grid[i][j] != 0:
-                    k = i
-                    while k < self.grid_size - 1 and self.grid[k+1][j] == 0:
-                        self.grid[k+1][j] = self.grid[k][j]
-                        self.grid[k][j] = 0
-                        k += 1
-            
-            # Merge tiles
-            for i in range(self.grid_size - 1, 0, -1):
-                if self.grid[i][j] != 0 and self.grid[i][j] == self.grid[i-1][j]:
-                    self.grid[i][j] *= 2
-                    self.score += self.grid[i][j]
-                    self.grid[i-1][j] = 0
-            
-            # Compact again after merging
-            for i in range(self.grid_size - 2, -1, -1):
-                if self.grid[i][j] != 0:
-                    k = i
-                    while k < self.grid_size - 1 and self.grid[k+1][j] == 0:
-                        self.grid[k+1][j] = self.grid[k][j]
-                        self.grid[k][j] = 0
-                        k += 1
-        
-        # Check if the grid changed
-        return self.grid != old_grid
-    
-    def _move_left(self):
-        """Move tiles left and merge if possible."""
-        moved = False
-        old_grid = [row[:] for row in self.grid]
-        
-        for i in range(self.grid_size):
-            # Compact row (move all tiles left)
-            for j in range(1, self.grid_size):
-                if self.grid[i][j] != 0:
-                    k = j
-                    while k > 0 and self.grid[i][k-1] == 0:
-                        self.grid[i][k-1] = self.grid[i][k]
-                        self.grid[i][k] = 0
-                        k -= 1
-            
-            # Merge tiles
-            for j in range(self.grid_size - 1):
-                if self.grid[i][j] != 0 and self.grid[i][j] == self.grid[i][j+1]:
-                    self.grid[i][j] *= 2
-                    self.score += self.grid[i][j]
-                    self.grid[i][j+1] = 0
-            
-            # Compact again after merging
-            for j in range(1, self.grid_size):
-                if self.grid[i][j] != 0:
-                    k = j
-                    while k > 0 and self.grid[i][k-1] == 0:
-                        self.grid[i][k-1] = self.grid[i][k]
-                        self.grid[i][k] = 0
-                        k -= 1
-        
-        # Check if the grid changed
-        return self.grid != old_grid
-    
-    def _move_right(self):
-        """Move tiles right and merge if possible."""
-        moved = False
-        old_grid = [row[:] for row in self.grid]
-        
-        for i in range(self.grid_size):
-            # Compact row (move all tiles right)
-            for j in range(self.grid_size - 2, -1, -1):
-                if self.grid[i][j] != 0:
-                    k = j
-                    while k < self.grid_size - 1 and self.grid[i][k+1] == 0:
-                        self.grid[i][k+1] = self.grid[i][k]
-                        self.grid[i][k] = 0
-                        k += 1
-            
-            # Merge tiles
-            for j in range(self.grid_size - 1, 0, -1):
-                if self.grid[i][j] != 0 and self.grid[i][j] == self.grid[i][j-1]:
-                    self.grid[i][j] *= 2
-                    self.score += self.grid[i][j]
-                    self.grid[i][j-1] = 0
+    def snapshot(self):
+        """The current board, score and win, packed for the undo history."""
+        return pack_grid(self.grid), self.score, self.won
+    
+    def restore(self, state):
+        """Go back to a snapshot from the undo history, if there is one."""
+        if state is None:
+            return False
+        # A replay can't go backwards, so the recorded game ends where it was
+        if self.replay is not None:
+            self.replay.end_game(self.score)
+        # Undoing the move that reached 2048 takes the win back, so reaching
+        # it again plays the win cue again
+        packed, self.score, self.won = state
+        self.grid = unpack_grid(packed, self.grid_size)
+        self.stop_animations()
+        self.autosave()
+        return True
+    
+    def undo(self):
+        """Take back the last move, returning whether there was one."""
+        return self.restore(self.history.undo(self.snapshot()))
+    
+    def redo(self):
+        """Play the last undone move again, returning whether there was one."""
+        return self.restore(self.history.redo(self.snapshot()))
+    
+    def play_move_sound(self):
+        """Play the cue for the move just made: win, game over, merge or move."""
+        if not self.won and self.board.contains_tile(2048):
+            self.won = True
+            self.sounds.play("win")
+        elif not self.board.moves_available():
+            self.sounds.play("game_over")
+        else:
+            self.sounds.play_move(self.board.last_diff)
+    
+    def start_animations(self):
+        """Animate the tiles of the last move from the board's recorded movements."""
+        # Cells hidden by an unfinished animation get their tiles back
+        self.dirty_cells.update(self.animating_cells)
+        self.animations.clear()
+        self.animating_cells.clear()
+        rects = self.cell_rects
+        for from_row, from_col, to_row, to_col, value, merged in self.board.last_diff.moves:
+            target = (to_row, to_col)
+            # Tiles that merge in place still slide (nowhere) so they stay visible
+            self.animations.add_move_animation(
+                rects[from_row][from_col].topleft,
+                rects[to_row][to_col].topleft,
+                value,
+                SLIDE_MS
+            )
+            if merged and target not in self.animating_cells:
+                self.animations.add_merge_animation(
+                    rects[to_row][to_col].topleft,
+                    value * 2,
+                    MERGE_MS,
+                    delay=SLIDE_MS
+                )
+            self.animating_cells.add(target)
+    
+    def stop_animations(self):
+        """Drop any running animation, leaving the board to show its tiles."""
+        self.animations.clear()
+        self.animating_cells.clear()
+        self.board_stale = True
+    
+    def update_animations(self, dt):
+        """Advance the animations by dt milliseconds."""
+        self.animations.update(min(dt, MAX_FRAME_MS))
+        
+        # A cell shows its tile again as soon as no running animation ends on it
+        covered = {animation.end_pos for animation in self.animations.animations}
+        for row, col in list(self.animating_cells):
+            if self.cell_rects[row][col].topleft not in covered:
+                self.animating_cells.discard((row, col))
+                self.dirty_cells.add((row, col))
+    
+    def ui_state(self):
+        """Everything besides the board and scores that changes what is on screen."""
+        return (
+            self.settings.dark_mode,
+            self.show_settings,
+            self.tutorial.show,
+            self.tutorial.current_slide,
+        )
+    
+    def draw_frame(self):
+        """Draw the whole screen."""
+        theme = "dark" if self.settings.dark_mode else "light"
+        self.render_cache.set_theme(theme)
+        
+        # Static chrome first, then only the dynamic content on top
+        self.screen.blit(self.static_layer(theme), (0, 0))
+        self.draw_board()
+        self.draw_ui()
+        
+        if self.show_settings:
+            self.draw_settings()
             
-            # Compact again after merging
-            for j in range(self.grid_size - 2, -1, -1):
-                if self.grid[i][j] != 0:
-                    k = j
-                    while k < self.grid_size - 1 and self.grid[i][k+1] == 0:
-                        self.grid[i][k+1] = self.grid[i][k]
-                        self.grid[i][k] = 0
-                        k += 1
-        
-        # Check if the grid changed
-        return self.grid != old_grid
+        if self.tutorial.show:
+            self.tutorial.draw(self.screen)
+        
+        if self.profiler.show_overlay:
+            self.draw_profiler_overlay()
+    
+    def toggle_profiler(self):
+        """Show or hide the frame-time overlay, timing frames while it is shown."""
+        profiler = self.profiler
+        profiler.show_overlay = not profiler.show_overlay
+        if profiler.show_overlay:
+            profiler.enable()
+        elif self.profile_path is None:
+            profiler.disable()
+        self._overlay_rect = None
+        self.needs_full_redraw = True
+    
+    def draw_profiler_overlay(self):
+        """Draw the frame-time percentiles in the top left corner, returning their rectangle."""
+        theme = "dark" if self.settings.dark_mode else "light"
+        colors = COLORS[theme]
+        overlay = self.profiler.overlay_surface(
+            self.get_font(max(10, self.scaled(16))),
+            colors["text"],
+            colors["grid_background"]
+        )
+        rect = overlay.get_rect(topleft=(self.scaled(10), self.scaled(10)))
+        
+        # Clear whatever a previous, possibly larger, overlay left behind
+        if self._overlay_rect is not None:
+            self.screen.blit(self.static_layer(theme), self._overlay_rect, self._overlay_rect)
+        self.screen.blit(overlay, rect)
+        
+        dirty = rect.union(self._overlay_rect) if self._overlay_rect is not None else rect
+        self._overlay_rect = rect
+        return dirty
+    
+    def present(self, dirty_rects=None):
+        """Push the frame to the display, only the given rectangles if any."""
+        if dirty_rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(dirty_rects)
+    
+    def render(self):
+        """Redraw whatever changed since the last frame and push it to the display.
+        
+        Cells changed by moves, as reported by the board's move diffs, and
+        score boxes are redrawn on their own and only their rectangles are
+        updated. Anything else, such as opening a panel or switching theme,
+        redraws the whole screen. While a panel is open, any change redraws
+        the whole screen too, so the board is never drawn over the panel.
+        """
+        scores = (self.score, self.highest_score)
+        ui_state = self.ui_state()
+        panel_open = self.show_settings or self.tutorial.show
+        changed = self.board_stale or self.dirty_cells or scores != self._drawn_scores
+        
+        if self.needs_full_redraw or ui_state != self._drawn_ui_state or (panel_open and changed):
+            self.draw_frame()
+            self.present()
+        elif panel_open:
+            return
+        else:
+            theme = "dark" if self.settings.dark_mode else "light"
+            dirty_rects = []
+            if self.board_stale:
+                # New boards touch any cell, so redraw the board whole
+                self.draw_board()
+                dirty_rects.append(self.board_rect)
+            elif self.dirty_cells or self._animation_rects or self.animations.is_animating():
+                dirty_rects.extend(self.draw_board_changes(theme))
+            if scores != self._drawn_scores:
+                dirty_rects.extend(self.draw_ui())
+            if not dirty_rects:
+                return
+            if self.profiler.show_overlay:
+                dirty_rects.append(self.draw_profiler_overlay())
+            self.present(dirty_rects)
+        
+        # Remember what is on screen to find the dirty regions next frame
+        self.needs_full_redraw = False
+        self.board_stale = False
+        self.dirty_cells.clear()
+        self._drawn_scores = scores
+        self._drawn_ui_state = ui_state
     
     def run(self):
         """Main game loop."""
         clock = pygame.time.Clock()
         
+        # Show the first frame before loading anything it doesn't need
+        self.render()
+        print(self.assets.startup_report())
+        self.assets.load_background()
+        
         while True:
-            # Handle input
-            self.handle_input()
+            if self.animations.is_animating():
+                # Keep drawing frames while tiles are moving
+                events = pygame.event.get()
+            else:
+                # Nothing changes on screen without input, so sleep until an
+                # event arrives instead of redrawing identical frames
+                event = pygame.event.wait(IDLE_WAIT_MS)
+                events = pygame.event.get()
+                if event.type != pygame.NOEVENT:
+                    events.insert(0, event)
             
-            # Draw everything
-            theme = "dark" if self.settings.dark_mode else "light"
-            self.screen.fill(COLORS[theme]["background"])
+            dt = clock.tick(60)
+            self.profiler.begin_frame()
             
-            # Draw settings icon aligned with the "KIDS 2048" heading
-            settings_icon_rect = pygame.Rect(
-                self.board_x + self.board_width - 50,  # Aligned with right edge of tile grid
-                self.board_y - 150,  # Exactly aligned with "KIDS 2048" heading
-                40, 
-                40
-            )
-            self.settings_button_rect = settings_icon_rect
-            
-            pygame.draw.rect(
-                self.screen,
-                COLORS[theme]["button"],
-                self.settings_button_rect,
-                border_radius=5
-            )
-            self.screen.blit(self.settings_icon, self.settings_button_rect.topleft)
-            
-            self.draw_board()
-            self.draw_ui()
+            # Handle input
+            self.handle_input(events)
             
-            if self.show_settings:
-                self.draw_settings()
-                
-            if self.tutorial.show:
-                self.tutorial.draw(self.screen)
+            if self.animations.is_animating():
+                self.update_animations(dt)
             
-            # Update display
-            pygame.display.flip()
-            clock.tick(60)
+            # Draw whatever changed
+            self.render()
+            self.profiler.end_frame()
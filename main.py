@@ -2,14 +2,46 @@
 """
 Main entry point for the Kids 2048 game.
 """
-import os
-from game import Game
+import argparse
+
+from utils.constants import MAX_GRID_SIZE, MIN_GRID_SIZE
+from utils.policies import POLICIES
+from utils.replay import MAX_SEED
 
 if __name__ == "__main__":
-    # Make sure assets directory exists
-    os.makedirs(os.path.join("assets", "fonts"), exist_ok=True)
-    os.makedirs(os.path.join("assets", "images"), exist_ok=True)
-    os.makedirs(os.path.join("assets", "sounds"), exist_ok=True)
-    
-    game = Game()
-    game.run()
+    parser = argparse.ArgumentParser(description="Kids 2048")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Seed for tile spawns, making games reproducible")
+    parser.add_argument("--size", type=int, default=4,
+                        help=f"Board size, from {MIN_GRID_SIZE} to {MAX_GRID_SIZE} cells a side")
+    parser.add_argument("--headless", action="store_true",
+                        help="Play games with an AI policy without opening a window")
+    parser.add_argument("--policy", default="expectimax", choices=POLICIES,
+                        help="AI policy for headless games")
+    parser.add_argument("--games", type=int, default=1, help="Number of headless games to play")
+    parser.add_argument("--record", metavar="FILE", default=None,
+                        help="Append every game to this replay file "
+                             "(replays.bin by default when playing in a window)")
+    parser.add_argument("--profile", metavar="FILE", default=None,
+                        help="Record every frame's timings to FILE as the game runs "
+                             "(a Chrome trace for .json, JSONL otherwise)")
+    args = parser.parse_args()
+    if not MIN_GRID_SIZE <= args.size <= MAX_GRID_SIZE:
+        parser.error(f"--size must be from {MIN_GRID_SIZE} to {MAX_GRID_SIZE}")
+    if args.headless and args.policy == "expectimax" and args.size != 4:
+        parser.error("the expectimax policy only plays 4x4 boards")
+    # Headless game i uses seed + i, and every seed must fit a replay
+    last_seed = MAX_SEED - max(args.games - 1, 0) if args.headless else MAX_SEED
+    if args.seed is not None and not 0 <= args.seed <= last_seed:
+        parser.error(f"--seed must be from 0 to {last_seed}")
+
+    if args.headless:
+        # The simulation code never imports pygame, so this starts in milliseconds
+        from utils.simulation import run_headless
+        run_headless(args.policy, args.games, seed=args.seed or 0, size=args.size, record=args.record)
+    else:
+        from game import Game
+
+        game = Game(seed=args.seed, profile_path=args.profile, replay_path=args.record or "replays.bin",
+                    size=args.size)
+        game.run()
@@ -0,0 +1,122 @@
+"""
+Equivalence tests: every board engine must move exactly like GameBoard.
+"""
+import random
+
+import pytest
+
+from utils.bitboard import BitBoard
+from utils.game_logic import GameBoard
+from utils.packed import PackedBoard
+
+DIRECTIONS = ("left", "right", "up", "down")
+VALUES = (2, 2, 2, 4, 4, 8, 16, 32, 64, 128, 1024, 16384)
+
+
+def random_grids(size, count, seed):
+    """Generate grids from nearly empty to full, where merges are most likely."""
+    rng = random.Random(seed)
+    grids = []
+    for _ in range(count):
+        cells = [0] * (size * size)
+        filled = rng.randint(0, size * size)
+        for index in rng.sample(range(size * size), filled):
+            cells[index] = rng.choice(VALUES[:rng.randint(2, len(VALUES))])
+        grids.append([cells[row * size:(row + 1) * size] for row in range(size)])
+    return grids
+
+
+def reference(grid, direction):
+    """Apply a move with GameBoard and return (moved, score_gain, grid)."""
+    board = GameBoard(len(grid))
+    board.grid = [row[:] for row in grid]
+    moved = getattr(board, f"move_{direction}")()
+    return moved, board.score_increment if moved else 0, board.grid
+
+
+def reference_moves_available(grid):
+    board = GameBoard(len(grid))
+    board.grid = [row[:] for row in grid]
+    return board.moves_available()
+
+
+@pytest.mark.parametrize("board_class, sizes", [
+    (BitBoard, (4,)),
+    (PackedBoard, range(3, 17)),
+])
+def test_board_matches_game_board(board_class, sizes):
+    for size in sizes:
+        for grid in random_grids(size, 300, seed=size):
+            for direction in DIRECTIONS:
+                board = board_class.from_grid(grid)
+                moved = getattr(board, f"move_{direction}")()
+                score = board.score_increment if moved else 0
+                assert (moved, score, board.grid) == reference(grid, direction)
+            assert board_class.from_grid(grid).moves_available() == reference_moves_available(grid)
+
+
+@pytest.mark.parametrize("board_class, sizes", [
+    (BitBoard, (4,)),
+    (PackedBoard, range(3, 17)),
+])
+def test_contains_tile_matches_game_board(board_class, sizes):
+    values = (0, 1, 2, 3, 4, 6, 1024, 2048, 16384, 32768, 65536, -2)
+    for size in sizes:
+        for grid in random_grids(size, 100, seed=size):
+            board = board_class.from_grid(grid)
+            reference_board = GameBoard(size)
+            reference_board.grid = [row[:] for row in grid]
+            for value in values:
+                assert board.contains_tile(value) == reference_board.contains_tile(value)
+
+
+def test_batch_board_matches_game_board():
+    np = pytest.importorskip("numpy")
+    from utils.batch import BatchBoard, DIRECTIONS as BATCH_DIRECTIONS
+
+    for size in (3, 4, 5, 8):
+        grids = random_grids(size, 300, seed=size)
+        for code, direction in enumerate(BATCH_DIRECTIONS):
+            batch = BatchBoard.from_grids(grids)
+            moved = batch.move(np.full(len(grids), code))
+            for i, grid in enumerate(grids):
+                expected = reference(grid, direction)
+                assert (bool(moved[i]), int(batch.score_increment[i]), batch.grids[i].tolist()) == expected
+        batch = BatchBoard.from_grids(grids)
+        assert batch.moves_available().tolist() == [reference_moves_available(grid) for grid in grids]
+
+
+def test_batch_board_rejects_unknown_moves():
+    pytest.importorskip("numpy")
+    from utils.batch import BatchBoard
+
+    batch = BatchBoard(3, 4, seed=0)
+    with pytest.raises(ValueError):
+        batch.move([0, 4, 1])
+    with pytest.raises(ValueError):
+        batch.move([0, 1])
+
+
+def test_spawns_only_depend_on_grid_and_generator():
+    rng = random.Random(0)
+    board = GameBoard(4, rng=random.Random(1))
+    for _ in range(30):
+        getattr(board, f"move_{rng.choice(DIRECTIONS)}")()
+        board.add_random_tile()
+
+    # A rebuilt board and every other engine spawn where the original does
+    state = board.rng.getstate()
+    grid = [row[:] for row in board.grid]
+    rebuilt = GameBoard(4)
+    rebuilt.grid = [row[:] for row in grid]
+    rebuilt.rng.setstate(state)
+    others = [board_class.from_grid(grid) for board_class in (BitBoard, PackedBoard)]
+    for other in others:
+        other.rng.setstate(state)
+
+    for direction in DIRECTIONS * 5:
+        for each in [board, rebuilt] + others:
+            getattr(each, f"move_{direction}")()
+            each.add_random_tile()
+        assert rebuilt.grid == board.grid
+        assert all(other.grid == board.grid for other in others)
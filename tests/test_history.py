@@ -0,0 +1,89 @@
+"""
+Undo and redo history, and the packed snapshots it holds.
+"""
+import pytest
+
+from utils.history import History
+from utils.packed import pack_grid, unpack_grid
+
+
+def state(value):
+    """A snapshot of a 2x2 board holding value in its first cell."""
+    return pack_grid([[value, 0], [0, 0]]), value
+
+
+def test_pack_grid_round_trips():
+    grid = [[0, 2, 4], [8, 2048, 0], [32768, 0, 2**40]]
+    packed = pack_grid(grid)
+    assert len(packed) == 9
+    assert unpack_grid(packed, 3) == grid
+
+
+def test_undo_and_redo_walk_the_recorded_states():
+    history = History()
+    for value in (2, 4, 8):
+        history.record(state(value))
+    current = state(16)
+
+    for expected in (8, 4, 2):
+        current = history.undo(current)
+        assert current == state(expected)
+    assert history.undo(current) is None
+    assert not history.can_undo
+
+    for expected in (4, 8, 16):
+        current = history.redo(current)
+        assert current == state(expected)
+    assert history.redo(current) is None
+    assert not history.can_redo
+
+
+def test_recording_after_an_undo_discards_the_redo_steps():
+    history = History()
+    history.record(state(2))
+    history.record(state(4))
+    assert history.undo(state(8)) == state(4)
+    assert history.can_redo
+
+    history.record(state(32))
+    assert not history.can_redo
+    assert history.bytes == 8
+    assert history.undo(state(64)) == state(32)
+
+
+def test_max_bytes_drops_the_oldest_steps():
+    history = History(max_bytes=12)
+    for value in (2, 4, 8, 16, 32):
+        history.record(state(value))
+    assert history.bytes == 12
+    assert list(history.undo_stack) == [state(8), state(16), state(32)]
+
+    # Undoing moves a step between the stacks, so the total stays the same
+    current = history.undo(state(64))
+    assert history.bytes == 12
+    assert list(history.undo_stack) == [state(8), state(16)]
+    assert history.redo_stack == [state(64)]
+    assert history.redo(current) == state(64)
+
+    history.clear()
+    assert history.bytes == 0
+    assert not history.can_undo and not history.can_redo
+
+
+def test_undo_takes_back_a_win(monkeypatch):
+    pytest.importorskip("pygame")
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    monkeypatch.setenv("SDL_AUDIODRIVER", "dummy")
+    from game import Game
+
+    game = Game(seed=0, data_path=None)
+    played = []
+    monkeypatch.setattr(game.sounds, "play", played.append)
+    game.grid = [[1024, 1024, 0, 0], [0] * 4, [0] * 4, [0] * 4]
+
+    assert game.move_tiles("left") and game.won
+    assert game.undo() and not game.won
+    assert game.grid[0] == [1024, 1024, 0, 0]
+    assert game.redo() and game.won
+    assert game.undo() and game.move_tiles("left")
+    assert played == ["win", "win"]
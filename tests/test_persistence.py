@@ -0,0 +1,91 @@
+"""
+Saving game data: atomic writes, debounced autosaves and resuming a game.
+"""
+import os
+import random
+import time
+
+import pytest
+
+from utils.persistence import Autosaver, atomic_write_json, load_json
+
+DIRECTIONS = ("left", "right", "up", "down")
+
+
+def test_atomic_write_keeps_the_old_file_when_writing_fails(tmp_path):
+    path = tmp_path / "data.json"
+    atomic_write_json(str(path), {"highest_score": 10})
+    with pytest.raises(TypeError):
+        atomic_write_json(str(path), {"highest_score": object()})
+    assert load_json(str(path)) == {"highest_score": 10}
+    assert os.listdir(tmp_path) == ["data.json"]
+
+
+def test_missing_or_corrupt_files_load_as_none(tmp_path):
+    path = tmp_path / "data.json"
+    assert load_json(str(path)) is None
+    path.write_text('{"highest_score": 1')
+    assert load_json(str(path)) is None
+
+
+def test_autosaver_writes_a_burst_of_saves_once(tmp_path):
+    path = tmp_path / "data.json"
+    autosaver = Autosaver(str(path), delay=0.2)
+    for score in range(50):
+        autosaver.save({"highest_score": score})
+
+    deadline = time.monotonic() + 5
+    while autosaver.writes == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert autosaver.writes == 1
+    assert load_json(str(path)) == {"highest_score": 49}
+
+    # Closing writes what is still pending without waiting for the delay
+    autosaver.save({"highest_score": 50})
+    autosaver.close()
+    assert autosaver.writes == 2
+    assert load_json(str(path)) == {"highest_score": 50}
+
+
+def test_flush_writes_immediately(tmp_path):
+    path = tmp_path / "data.json"
+    autosaver = Autosaver(str(path), delay=60)
+    autosaver.save({"highest_score": 1})
+    autosaver.flush()
+    assert load_json(str(path)) == {"highest_score": 1}
+    autosaver.close()
+    assert autosaver.writes == 1
+
+
+def play(game, rng, moves):
+    """Play moves in random directions and return the states after each one."""
+    states = []
+    for _ in range(moves):
+        game.move_tiles(rng.choice(DIRECTIONS))
+        states.append((game.game_seed, game.score, game.won, [row[:] for row in game.grid]))
+    return states
+
+
+def test_resumed_game_continues_like_the_original(tmp_path, monkeypatch):
+    pytest.importorskip("pygame")
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    monkeypatch.setenv("SDL_AUDIODRIVER", "dummy")
+    from game import Game
+
+    path = str(tmp_path / "game_data.json")
+    original = Game(seed=7, data_path=path)
+    play(original, random.Random(0), 30)
+    original.save_game_data()
+    original.autosaver.close()
+
+    resumed = Game(data_path=path)
+    resumed.autosaver.close()
+    assert resumed.grid == original.grid
+    assert (resumed.game_seed, resumed.score) == (original.game_seed, original.score)
+
+    # The same moves spawn the same tiles, and the next game gets the same seed
+    assert play(resumed, random.Random(1), 50) == play(original, random.Random(1), 50)
+    resumed.restart_game()
+    original.restart_game()
+    assert resumed.game_seed == original.game_seed
+    assert play(resumed, random.Random(2), 50) == play(original, random.Random(2), 50)
@@ -0,0 +1,43 @@
+"""
+Frame profiler recordings must keep every frame of a session.
+"""
+import json
+
+import pytest
+
+from utils.profiler import FrameProfiler
+
+
+class Target:
+    def work(self):
+        pass
+
+
+def profile_frames(path, frames, history):
+    target = Target()
+    profiler = FrameProfiler(history=history)
+    profiler.instrument(target, "work")
+    profiler.enable()
+    profiler.record(str(path))
+    for _ in range(frames):
+        profiler.begin_frame()
+        target.work()
+        profiler.end_frame()
+    profiler.close()
+    return profiler
+
+
+@pytest.mark.parametrize("name", ["frames.jsonl", "trace.json"])
+def test_recording_outlasts_the_rolling_window(tmp_path, name):
+    path = tmp_path / name
+    profiler = profile_frames(path, frames=500, history=100)
+    assert len(profiler.frames) == 100
+
+    text = path.read_text()
+    if name.endswith(".json"):
+        events = json.loads(text)
+        assert [event["name"] for event in events] == ["frame", "work"] * 500
+    else:
+        records = [json.loads(line) for line in text.splitlines()]
+        assert [record["frame"] for record in records] == list(range(500))
+        assert all(set(record["sections"]) == {"work"} for record in records)
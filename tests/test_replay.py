@@ -0,0 +1,66 @@
+"""
+Replay files: round trips, and recovery from a crash partway through a game.
+"""
+import os
+import shutil
+
+import pytest
+
+from utils.replay import MAX_SEED, ReplayWriter, read_replays
+from utils.simulation import play_game
+
+# 4x4 spawns take one byte and 12x12 spawns two
+SIZES = (4, 12)
+MAX_MOVES = 300
+
+
+def record(path, seeds, size, max_moves=MAX_MOVES):
+    """Record a random-policy game per seed and return their results."""
+    with ReplayWriter(str(path)) as writer:
+        return [play_game("random", seed, size, max_moves=max_moves, replay=writer) for seed in seeds]
+
+
+def check_replays(path, results):
+    """Check that the file holds exactly these games and that they replay to their scores."""
+    replays = list(read_replays(str(path)))
+    assert [replay.seed for replay in replays] == [result["seed"] for result in results]
+    for replay, result in zip(replays, results):
+        assert len(replay.moves) == result["moves"]
+        assert replay.score == result["score"]
+        assert sum(gain for _, _, gain in replay.positions()) == result["score"]
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_games_replay_to_their_scores(tmp_path, size):
+    path = tmp_path / "games.bin"
+    results = record(path, range(3), size)
+    check_replays(path, results)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_reopening_drops_a_game_cut_off_by_a_crash(tmp_path, size):
+    path = tmp_path / "games.bin"
+    finished = record(path, range(3), size)
+    end = os.path.getsize(path)
+    record(path, [3], size)
+    length = os.path.getsize(path)
+
+    # A crash can cut the last game anywhere: in its header, halfway through
+    # a chunk of moves or spawns, or just before its final score
+    cuts = list(range(end + 1, end + 20)) + list(range(end + 20, length - 5, 41)) + list(range(length - 5, length))
+    for cut in cuts:
+        copy = tmp_path / f"cut{cut}.bin"
+        shutil.copy(path, copy)
+        os.truncate(copy, cut)
+        check_replays(copy, finished)
+
+        appended = record(copy, range(10, 12), size, max_moves=20)
+        check_replays(copy, finished + appended)
+
+
+def test_seeds_outside_the_u64_range_are_rejected(tmp_path):
+    with ReplayWriter(str(tmp_path / "games.bin")) as writer:
+        for seed in (-1, MAX_SEED + 1):
+            with pytest.raises(ValueError):
+                writer.begin_game(seed, 4, [])
+            assert not writer.in_game
@@ -0,0 +1,27 @@
+"""
+Headless games must not depend on which engine plays them.
+"""
+import pytest
+
+from utils.replay import ReplayWriter
+from utils.simulation import play_game
+
+RESULT_KEYS = ("score", "max_tile", "moves")
+
+
+@pytest.mark.parametrize("policy, size, max_moves", [
+    ("random", 3, None),
+    ("random", 4, None),
+    ("greedy", 4, None),
+    ("expectimax", 4, 30),
+])
+def test_recorded_and_unrecorded_games_match(tmp_path, policy, size, max_moves):
+    # Unrecorded games play on PackedBoard, recorded ones on GameBoard
+    writer = ReplayWriter(str(tmp_path / "games.bin"))
+    try:
+        for seed in range(5):
+            plain = play_game(policy, seed, size, depth=1, max_moves=max_moves)
+            recorded = play_game(policy, seed, size, depth=1, max_moves=max_moves, replay=writer)
+            assert [plain[key] for key in RESULT_KEYS] == [recorded[key] for key in RESULT_KEYS]
+    finally:
+        writer.close()
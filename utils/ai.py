@@ -0,0 +1,234 @@
+"""
+Expectimax AI player for the 2048 game.
+
+The search runs on the packed 64-bit boards from utils.bitboard. Max nodes
+try each of the four moves and chance nodes average over every empty cell
+receiving a 2 (probability 0.9) or a 4 (probability 0.1), the same odds used
+by GameBoard.add_random_tile. To make this fast enough to play live:
+
+* chance nodes are cached in a bounded transposition table with LRU eviction,
+* branches whose cumulative probability falls below a cutoff are evaluated
+  with the heuristic instead of being searched, and
+* the search deepens iteratively until a per-move time budget runs out,
+  keeping the best move of the deepest completed iteration.
+"""
+import time
+from collections import OrderedDict
+
+from utils.bitboard import ROW_MASK, encode_grid, execute_move, transpose
+
+DIRECTIONS = ("up", "down", "left", "right")
+
+# Spawn odds, matching GameBoard.add_random_tile (exponent 1 is a 2, 2 is a 4)
+SPAWN_PROBABILITIES = ((1, 0.9), (2, 0.1))
+
+# Heuristic weights for a single row, applied to every row and column
+LOST_PENALTY = 200000.0
+MONOTONICITY_POWER = 4.0
+MONOTONICITY_WEIGHT = 47.0
+SUM_POWER = 3.5
+SUM_WEIGHT = 11.0
+MERGES_WEIGHT = 700.0
+EMPTY_WEIGHT = 270.0
+
+_row_heuristics = {}
+
+
+def row_heuristic(row):
+    """Score a 16-bit row; higher is better.
+
+    Rewards empty cells, pending merges and rows that are monotonic in
+    either direction, and penalises rows crowded with large tiles.
+    """
+    cached = _row_heuristics.get(row)
+    if cached is not None:
+        return cached
+
+    tiles = [(row >> shift) & 0xF for shift in (0, 4, 8, 12)]
+    total = 0.0
+    empty = 0
+    merges = 0
+    previous = 0
+    counter = 0
+    for tile in tiles:
+        total += tile ** SUM_POWER
+        if tile == 0:
+            empty += 1
+        elif previous == tile:
+            counter += 1
+        else:
+            if counter > 0:
+                merges += 1 + counter
+            counter = 0
+            previous = tile
+    if counter > 0:
+        merges += 1 + counter
+
+    monotonic_left = 0.0
+    monotonic_right = 0.0
+    for i in range(1, 4):
+        if tiles[i - 1] > tiles[i]:
+            monotonic_left += tiles[i - 1] ** MONOTONICITY_POWER - tiles[i] ** MONOTONICITY_POWER
+        else:
+            monotonic_right += tiles[i] ** MONOTONICITY_POWER - tiles[i - 1] ** MONOTONICITY_POWER
+
+    score = (
+        LOST_PENALTY
+        + EMPTY_WEIGHT * empty
+        + MERGES_WEIGHT * merges
+        - MONOTONICITY_WEIGHT * min(monotonic_left, monotonic_right)
+        - SUM_WEIGHT * total
+    )
+    _row_heuristics[row] = score
+    return score
+
+
+def _rows_heuristic(board):
+    """Sum the row heuristic over the four rows of a board."""
+    return (
+        row_heuristic(board & ROW_MASK)
+        + row_heuristic((board >> 16) & ROW_MASK)
+        + row_heuristic((board >> 32) & ROW_MASK)
+        + row_heuristic(board >> 48)
+    )
+
+
+def evaluate(board):
+    """Score a packed board with the heuristic over its rows and columns."""
+    return _rows_heuristic(board) + _rows_heuristic(transpose(board))
+
+
+def pack(board):
+    """Return the packed 64-bit form of a BitBoard, GameBoard or packed int.
+
+    Raises ValueError for boards that don't fit a bitboard: other sizes, or
+    tiles above 32768.
+    """
+    if isinstance(board, int):
+        return board
+    packed = getattr(board, "board", None)
+    if isinstance(packed, int):
+        return packed
+    if getattr(board, "size", None) != 4:
+        raise ValueError("The AI only supports 4x4 boards")
+    return encode_grid(board.grid)
+
+
+class _SearchTimeout(Exception):
+    """Raised inside the search when the time budget runs out."""
+
+
+class ExpectimaxAI:
+    """Expectimax player with a transposition table and iterative deepening."""
+
+    def __init__(self, max_depth=6, time_limit=0.1, table_size=200000, probability_cutoff=1e-4):
+        """Initialize the player.
+
+        max_depth is the deepest number of moves to look ahead, time_limit
+        the budget per move in seconds (None for no limit), table_size the
+        maximum number of cached chance nodes, and probability_cutoff the
+        cumulative probability below which branches are not searched.
+        """
+        self.max_depth = max_depth
+        self.time_limit = time_limit
+        self.table_size = table_size
+        self.probability_cutoff = probability_cutoff
+        self.table = OrderedDict()
+        self._deadline = None
+        self._nodes = 0
+
+        # Statistics about the most recent call to best_move
+        self.depth_reached = 0
+        self.nodes_searched = 0
+
+    def clear(self):
+        """Drop every cached position."""
+        self.table.clear()
+
+    def best_move(self, board):
+        """Return the best direction for the given board, or None if it cannot move."""
+        board = pack(board)
+        candidates = [
+            direction for direction in DIRECTIONS
+            if execute_move(board, direction)[0] != board
+        ]
+        if len(candidates) <= 1:
+            self.depth_reached = 0
+            return candidates[0] if candidates else None
+
+        self._nodes = 0
+        self._deadline = None
+        if self.time_limit is not None:
+            self._deadline = time.perf_counter() + self.time_limit
+
+        best = candidates[0]
+        self.depth_reached = 0
+        for depth in range(1, self.max_depth + 1):
+            try:
+                best = self._search_root(board, depth)
+            except _SearchTimeout:
+                break
+            self.depth_reached = depth
+
+        self.nodes_searched = self._nodes
+        return best
+
+    def _search_root(self, board, depth):
+        """Pick the move with the highest expected value at the given depth."""
+        best_direction = None
+        best_score = -1.0
+        for direction in DIRECTIONS:
+            new_board, _ = execute_move(board, direction)
+            if new_board == board:
+                continue
+            score = self._chance_node(new_board, depth - 1, 1.0)
+            if score > best_score:
+                best_direction, best_score = direction, score
+        return best_direction
+
+    def _max_node(self, board, depth, probability):
+        """Value of the best move from a board, or 0 if the game is over."""
+        best = 0.0
+        for direction in DIRECTIONS:
+            new_board, _ = execute_move(board, direction)
+            if new_board != board:
+                score = self._chance_node(new_board, depth, probability)
+                if score > best:
+                    best = score
+        return best
+
+    def _chance_node(self, board, depth, probability):
+        """Expected value of a board over every possible tile spawn."""
+        if depth <= 0 or probability < self.probability_cutoff:
+            return evaluate(board)
+
+        table = self.table
+        entry = table.get(board)
+        if entry is not None and entry[0] >= depth:
+            table.move_to_end(board)
+            return entry[1]
+
+        self._nodes += 1
+        if self._deadline is not None and time.perf_counter() > self._deadline:
+            raise _SearchTimeout
+
+        empty_shifts = [shift for shift in range(0, 64, 4) if not (board >> shift) & 0xF]
+        if not empty_shifts:
+            return self._max_node(board, depth - 1, probability)
+
+        cell_probability = probability / len(empty_shifts)
+        total = 0.0
+        for shift in empty_shifts:
+            for exponent, spawn_probability in SPAWN_PROBABILITIES:
+                total += spawn_probability * self._max_node(
+                    board | (exponent << shift),
+                    depth - 1,
+                    cell_probability * spawn_probability,
+                )
+        score = total / len(empty_shifts)
+
+        table[board] = (depth, score)
+        table.move_to_end(board)
+        if len(table) > self.table_size:
+            table.popitem(last=False)
+        return score
@@ -1,77 +1,143 @@
 """
 Animation system for the 2048 game.
 """
-import pygame
+import math
+
 
 class Animation:
-    def __init__(self, start_pos, end_pos, duration, value):
+    """A single tile animation: a slide between two positions or a merge pop."""
+
+    __slots__ = ("kind", "start_pos", "end_pos", "duration", "delay", "elapsed", "value", "active")
+
+    def __init__(self, start_pos=(0, 0), end_pos=(0, 0), duration=0, value=0, kind="move", delay=0):
         """Initialize an animation."""
+        self.reset(start_pos, end_pos, duration, value, kind, delay)
+
+    def reset(self, start_pos, end_pos, duration, value, kind="move", delay=0):
+        """Reinitialize the animation so pooled objects can be reused."""
+        self.kind = kind
         self.start_pos = start_pos
         self.end_pos = end_pos
         self.duration = duration
+        self.delay = delay
         self.elapsed = 0
         self.value = value
         self.active = True
-    
+
     def update(self, dt):
         """Update the animation."""
         if not self.active:
             return
-        
+
+        if self.delay > 0:
+            self.delay -= dt
+            if self.delay > 0:
+                return
+            # Carry the time left over after the delay into the animation
+            dt = -self.delay
+            self.delay = 0
+
         self.elapsed += dt
         if self.elapsed >= self.duration:
             self.active = False
-    
+
+    @property
+    def started(self):
+        """Whether the animation's delay has passed."""
+        return self.delay <= 0
+
+    def get_progress(self):
+        """Fraction of the animation that has played, from 0 to 1."""
+        if not self.active or self.duration <= 0:
+            return 1.0
+        return min(self.elapsed / self.duration, 1.0)
+
     def get_current_pos(self):
         """Get the current position of the animated object."""
         if not self.active:
             return self.end_pos
-        
-        progress = min(self.elapsed / self.duration, 1.0)
+
+        progress = self.get_progress()
         x = self.start_pos[0] + (self.end_pos[0] - self.start_pos[0]) * progress
         y = self.start_pos[1] + (self.end_pos[1] - self.start_pos[1]) * progress
         return (x, y)
 
+    def get_current_scale(self):
+        """Get the current scale of a merge pop, which swells and settles back to 1."""
+        if self.kind != "merge":
+            return 1.0
+        return 1.0 + 0.2 * math.sin(math.pi * self.get_progress())
+
+
 class AnimationManager:
     def __init__(self):
         """Initialize the animation manager."""
         self.animations = []
-    
+
+        # Finished animations are kept for reuse so busy boards don't churn
+        # through short-lived objects and trigger garbage collection pauses
+        self.pool = []
+
+    def _acquire(self, start_pos, end_pos, duration, value, kind, delay=0):
+        """Take an animation from the pool (or create one) and start it."""
+        if self.pool:
+            animation = self.pool.pop()
+            animation.reset(start_pos, end_pos, duration, value, kind, delay)
+        else:
+            animation = Animation(start_pos, end_pos, duration, value, kind, delay)
+        self.animations.append(animation)
+        return animation
+
     def add_move_animation(self, start_pos, end_pos, value, duration=200):
         """Add a new move animation."""
-        self.animations.append(Animation(start_pos, end_pos, duration, value))
-    
-    def add_merge_animation(self, pos, value, duration=150):
-        """Add a new merge animation."""
-        # This could be expanded to include scaling or other effects
-        pass
-    
+        return self._acquire(start_pos, end_pos, duration, value, "move")
+
+    def add_merge_animation(self, pos, value, duration=150, delay=0):
+        """Add a new merge animation, a pop of the merged tile after an optional delay."""
+        return self._acquire(pos, pos, duration, value, "merge", delay)
+
     def update(self, dt):
         """Update all animations."""
-        for animation in self.animations:
+        animations = self.animations
+        kept = 0
+        for animation in animations:
             animation.update(dt)
-        
-        # Remove completed animations
-        self.animations = [a for a in self.animations if a.active]
-    
-    def draw(self, screen, tile_size, font):
-        """Draw all active animations."""
+            if animation.active:
+                animations[kept] = animation
+                kept += 1
+            else:
+                self.pool.append(animation)
+
+        # Remove completed animations in place
+        del animations[kept:]
+
+    def clear(self):
+        """Stop every animation immediately."""
+        self.pool.extend(self.animations)
+        self.animations.clear()
+
+    def draw(self, screen, tile_surface, tile_size):
+        """Draw all active animations, returning the rectangles drawn.
+
+        tile_surface(value, scale) returns the (cached) surface for a tile,
+        so no text is rendered while animating.
+        """
+        rects = []
         for animation in self.animations:
+            if not animation.started:
+                continue
+
             x, y = animation.get_current_pos()
-            
-            # Draw tile
-            pygame.draw.rect(
-                screen,
-                (237, 224, 200),  # Default color for simplicity
-                (x, y, tile_size, tile_size),
-                border_radius=8
-            )
-            
-            # Draw value
-            text = font.render(str(animation.value), True, (119, 110, 101))
-            text_rect = text.get_rect(center=(x + tile_size // 2, y + tile_size // 2))
-            screen.blit(text, text_rect)
-    
+            scale = animation.get_current_scale()
+            surface = tile_surface(animation.value, scale)
+            if scale != 1.0:
+                # Keep the scaled tile centered on its cell
+                offset = (surface.get_width() - tile_size) / 2
+                x -= offset
+                y -= offset
+            rects.append(screen.blit(surface, (x, y)))
+        return rects
+
     def is_animating(self):
         """Check if any animations are currently active."""
         return len(self.animations) > 0
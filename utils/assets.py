@@ -0,0 +1,138 @@
+"""
+Asset manager for the 2048 game.
+
+Fonts and images needed for the first frame are loaded on demand, with each
+font file read once and shared by every size. Everything else in the
+manifest, such as sounds, is loaded by a background thread once the game
+is on screen. Missing or broken assets are skipped, so the game still runs
+from a checkout without them.
+"""
+import io
+import os
+import threading
+import time
+
+import pygame
+
+# Every asset the game uses, relative to the assets directory. Images used
+# by the first frame are loaded on first use and the rest in the background,
+# along with the sounds.
+MANIFEST = {
+    "fonts": {
+        "main": os.path.join("fonts", "fredoka.ttf"),
+    },
+    "images": {
+        "settings": os.path.join("images", "settings.png"),
+    },
+    "sounds": {
+        "merge": os.path.join("sounds", "merge.wav"),
+        "move": os.path.join("sounds", "move.wav"),
+        "win": os.path.join("sounds", "win.wav"),
+        "game_over": os.path.join("sounds", "game_over.wav"),
+    },
+}
+
+
+class AssetManager:
+    """Loads and caches the game's fonts, images and sounds."""
+
+    def __init__(self, root="assets", manifest=MANIFEST):
+        """Initialize the manager for the assets under root."""
+        self.root = root
+        self.manifest = manifest
+        self.started = time.perf_counter()
+        self.timings = {}
+        self.font_data = {}
+        self.images = {}
+        self.sounds = {}
+        self._thread = None
+        self._loaded = threading.Event()
+
+    def path(self, relative):
+        """Return the path of an asset relative to the assets directory."""
+        return os.path.join(self.root, relative)
+
+    def _timed(self, label, start):
+        """Add the time since start to the timing for label."""
+        self.timings[label] = self.timings.get(label, 0.0) + time.perf_counter() - start
+
+    def font_bytes(self, name="main"):
+        """Return the contents of a font file, reading it on first use.
+
+        Returns None if the font is missing.
+        """
+        if name not in self.font_data:
+            start = time.perf_counter()
+            try:
+                with open(self.path(self.manifest["fonts"][name]), "rb") as f:
+                    self.font_data[name] = f.read()
+            except OSError:
+                print("Font not found, using system font")
+                self.font_data[name] = None
+            self._timed("fonts", start)
+        return self.font_data[name]
+
+    def font(self, size, name="main"):
+        """Create a font at a pixel size from the shared font file bytes."""
+        start = time.perf_counter()
+        data = self.font_bytes(name)
+        font = None
+        if data is not None:
+            try:
+                # Every font gets its own stream over the same bytes
+                font = pygame.font.Font(io.BytesIO(data), size)
+            except pygame.error:
+                print("Font not found, using system font")
+                self.font_data[name] = None
+        if font is None:
+            font = pygame.font.SysFont(None, size)
+        self._timed("fonts", start)
+        return font
+
+    def image(self, name):
+        """Return an image from the manifest, loading it on first use.
+
+        Returns None if the image is missing or can't be decoded.
+        """
+        if name not in self.images:
+            start = time.perf_counter()
+            try:
+                self.images[name] = pygame.image.load(self.path(self.manifest["images"][name]))
+            except (FileNotFoundError, pygame.error):
+                self.images[name] = None
+            self._timed("images", start)
+        return self.images[name]
+
+    def load_background(self):
+        """Start loading the non-critical assets on a background thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._load_background, name="asset-loader", daemon=True)
+            self._thread.start()
+
+    def _load_background(self):
+        """Decode every sound in the manifest and any image not loaded yet."""
+        for name in self.manifest["images"]:
+            self.image(name)
+
+        start = time.perf_counter()
+        mixer_ready = pygame.mixer.get_init() is not None
+        for name, relative in self.manifest["sounds"].items():
+            sound = None
+            if mixer_ready:
+                try:
+                    sound = pygame.mixer.Sound(self.path(relative))
+                except (FileNotFoundError, pygame.error):
+                    pass
+            self.sounds[name] = sound
+        self._timed("sounds", start)
+        self._loaded.set()
+
+    def wait(self, timeout=None):
+        """Wait for the background loading, returning whether it finished."""
+        return self._loaded.wait(timeout)
+
+    def startup_report(self):
+        """Describe how long startup took and where the time went."""
+        elapsed = (time.perf_counter() - self.started) * 1000
+        parts = ", ".join(f"{label} {seconds * 1000:.0f} ms" for label, seconds in sorted(self.timings.items()))
+        return f"First frame after {elapsed:.0f} ms" + (f" ({parts})" if parts else "")
@@ -0,0 +1,170 @@
+"""
+Batched game logic for the 2048 game, built on NumPy.
+
+BatchBoard stores N boards of the same size as one (N, size, size) integer
+array of tile values and applies a vector of moves to all of them in a
+single vectorized pass. Its semantics match utils.game_logic.GameBoard
+exactly: the same compaction and merge rules, the same score increments and
+the same 0.9/0.1 chance of spawning a 2 or a 4 in a uniformly chosen empty
+cell.
+
+NumPy is an optional dependency that is only needed for this module.
+"""
+import numpy as np
+
+# Move codes accepted by BatchBoard.move and BatchBoard.step
+LEFT, RIGHT, UP, DOWN = range(4)
+DIRECTIONS = ("left", "right", "up", "down")
+
+
+def _to_left(boards, direction):
+    """View boards so that the given move becomes a move to the left."""
+    if direction == RIGHT:
+        return boards[:, :, ::-1]
+    if direction == UP:
+        return boards.transpose(0, 2, 1)
+    if direction == DOWN:
+        return boards.transpose(0, 2, 1)[:, :, ::-1]
+    return boards
+
+
+def _from_left(boards, direction):
+    """Undo _to_left on boards that were moved to the left."""
+    if direction == RIGHT:
+        return boards[:, :, ::-1]
+    if direction == UP:
+        return boards.transpose(0, 2, 1)
+    if direction == DOWN:
+        return boards[:, :, ::-1].transpose(0, 2, 1)
+    return boards
+
+
+def _compact_left(boards):
+    """Slide every non-zero tile to the start of its row, keeping order."""
+    order = np.argsort(boards == 0, axis=-1, kind="stable")
+    return np.take_along_axis(boards, order, axis=-1)
+
+
+def merge_left(boards):
+    """Slide and merge every row of a stack of boards to the left.
+
+    Returns a tuple of (new_boards, score_gain) where score_gain holds one
+    value per board.
+    """
+    boards = _compact_left(boards)
+    score = np.zeros(len(boards), dtype=np.int64)
+    for i in range(boards.shape[-1] - 1):
+        current = boards[:, :, i]
+        following = boards[:, :, i + 1]
+        merge = (current != 0) & (current == following)
+        # The merged pair leaves a hole that stops it from merging again
+        current[merge] *= 2
+        following[merge] = 0
+        score += np.where(merge, current, 0).sum(axis=-1)
+    return _compact_left(boards), score
+
+
+class BatchBoard:
+    """N game boards of the same size stepped together."""
+
+    def __init__(self, count, size, seed=None, dtype=np.int64):
+        """Initialize count new boards of the given size."""
+        self.size = size
+        self.count = count
+        self.rng = np.random.default_rng(seed)
+        self.grids = np.zeros((count, size, size), dtype=dtype)
+        self.score_increment = np.zeros(count, dtype=np.int64)
+        self.scores = np.zeros(count, dtype=np.int64)
+
+        # Add initial tiles
+        self.add_random_tiles()
+        self.add_random_tiles()
+
+    @classmethod
+    def from_grids(cls, grids, seed=None):
+        """Create a batch from an (N, size, size) array or nested lists of tile values."""
+        grids = np.array(grids, dtype=np.int64)
+        batch = cls.__new__(cls)
+        batch.count, batch.size = grids.shape[0], grids.shape[1]
+        batch.rng = np.random.default_rng(seed)
+        batch.grids = grids
+        batch.score_increment = np.zeros(batch.count, dtype=np.int64)
+        batch.scores = np.zeros(batch.count, dtype=np.int64)
+        return batch
+
+    def add_random_tiles(self, mask=None):
+        """Add a random tile (2 or 4) to an empty cell of each selected board.
+
+        Returns a boolean array telling which boards received a tile.
+        """
+        flat = self.grids.reshape(self.count, -1)
+        empty = flat == 0
+        spawned = empty.any(axis=1)
+        if mask is not None:
+            spawned &= mask
+
+        rows = np.flatnonzero(spawned)
+        if len(rows):
+            # The arg-max of uniform keys over the empty cells is a uniform choice
+            keys = self.rng.random((len(rows), flat.shape[1]))
+            keys[~empty[rows]] = -1.0
+            cells = keys.argmax(axis=1)
+            values = np.where(self.rng.random(len(rows)) < 0.9, 2, 4)
+            flat[rows, cells] = values
+        return spawned
+
+    def move(self, moves):
+        """Apply one move per board without spawning new tiles.
+
+        moves is a sequence of LEFT/RIGHT/UP/DOWN codes, one per board.
+        Returns a boolean array telling which boards changed; the score
+        gained by each board is stored in score_increment. Raises ValueError
+        unless there is exactly one valid code per board.
+        """
+        moves = np.asarray(moves)
+        if moves.shape != (self.count,) or not np.isin(moves, (LEFT, RIGHT, UP, DOWN)).all():
+            raise ValueError("moves must hold one LEFT, RIGHT, UP or DOWN code per board")
+        canonical = np.empty_like(self.grids)
+        for direction in range(4):
+            selected = moves == direction
+            if selected.any():
+                canonical[selected] = _to_left(self.grids[selected], direction)
+
+        merged, score = merge_left(canonical)
+
+        new_grids = np.empty_like(self.grids)
+        for direction in range(4):
+            selected = moves == direction
+            if selected.any():
+                new_grids[selected] = _from_left(merged[selected], direction)
+
+        moved = (new_grids != self.grids).any(axis=(1, 2))
+        self.grids = new_grids
+        self.score_increment = np.where(moved, score, 0)
+        self.scores += self.score_increment
+        return moved
+
+    def step(self, moves):
+        """Apply one move per board and spawn a tile on every board that moved.
+
+        Returns a tuple of (moved, game_over) boolean arrays.
+        """
+        moved = self.move(moves)
+        self.add_random_tiles(moved)
+        return moved, self.game_over()
+
+    def contains_tile(self, value):
+        """Check which boards contain a tile with the given value."""
+        return (self.grids == value).any(axis=(1, 2))
+
+    def moves_available(self):
+        """Check which boards still have a move available."""
+        grids = self.grids
+        empty = (grids == 0).any(axis=(1, 2))
+        horizontal = (grids[:, :, 1:] == grids[:, :, :-1]).any(axis=(1, 2))
+        vertical = (grids[:, 1:, :] == grids[:, :-1, :]).any(axis=(1, 2))
+        return empty | horizontal | vertical
+
+    def game_over(self):
+        """Check which boards have no moves left."""
+        return ~self.moves_available()
@@ -0,0 +1,238 @@
+"""
+Bitboard engine for the 2048 game.
+
+A 4x4 board is stored as a single 64-bit integer. Each cell is a 4-bit
+nibble holding the log2 exponent of its tile (0 means empty), so the tile
+2 is stored as 1, 4 as 2 and so on up to 32768 (15). Cell (row, col) lives
+at bit offset 4 * (4 * row + col), which puts each row in its own 16 bits.
+Moves are a handful of lookups into the tables from utils.move_tables.
+
+32768 is the largest tile a nibble can hold. encode_grid refuses larger
+tiles, and two 32768 tiles never merge, so a board holding them can differ
+from GameBoard: where GameBoard would merge them, a move here leaves them
+apart and moves_available may report no moves.
+"""
+import random
+
+from utils.move_tables import ROW_LEFT, ROW_RIGHT, SCORE_LEFT, SCORE_RIGHT
+
+SIZE = 4
+ROW_MASK = 0xFFFF
+
+
+def encode_grid(grid):
+    """Pack a 4x4 list-of-lists of tile values into a 64-bit board.
+
+    Raises ValueError if the grid isn't 4x4 or holds a value that isn't a
+    tile from 2 to 32768.
+    """
+    if len(grid) != SIZE or any(len(row) != SIZE for row in grid):
+        raise ValueError(f"a bitboard holds a {SIZE}x{SIZE} grid")
+    board = 0
+    shift = 0
+    for row in grid:
+        for value in row:
+            if value:
+                exponent = value.bit_length() - 1
+                if value != 1 << exponent or not 1 <= exponent <= 15:
+                    raise ValueError(f"tile {value} doesn't fit in a bitboard")
+                board |= exponent << shift
+            shift += 4
+    return board
+
+
+def decode_board(board):
+    """Unpack a 64-bit board into a 4x4 list-of-lists of tile values."""
+    grid = []
+    for _ in range(SIZE):
+        row = []
+        for _ in range(SIZE):
+            exponent = board & 0xF
+            row.append(1 << exponent if exponent else 0)
+            board >>= 4
+        grid.append(row)
+    return grid
+
+
+def transpose(board):
+    """Swap rows and columns of a 64-bit board."""
+    a1 = board & 0xF0F00F0FF0F00F0F
+    a2 = board & 0x0000F0F00000F0F0
+    a3 = board & 0x0F0F00000F0F0000
+    a = a1 | (a2 << 12) | (a3 >> 12)
+    b1 = a & 0xFF00FF0000FF00FF
+    b2 = a & 0x00FF00FF00000000
+    b3 = a & 0x00000000FF00FF00
+    return b1 | (b2 >> 24) | (b3 << 24)
+
+
+def move_row_left(row):
+    """Slide and merge a 16-bit row to the left.
+
+    Returns a tuple of (new_row, score_gain).
+    """
+    return ROW_LEFT[row], SCORE_LEFT[row]
+
+
+def move_row_right(row):
+    """Slide and merge a 16-bit row to the right.
+
+    Returns a tuple of (new_row, score_gain).
+    """
+    return ROW_RIGHT[row], SCORE_RIGHT[row]
+
+
+def _move_rows(board, row_table, score_table):
+    """Look up each of the four rows in a row-transition table."""
+    r0 = board & ROW_MASK
+    r1 = (board >> 16) & ROW_MASK
+    r2 = (board >> 32) & ROW_MASK
+    r3 = board >> 48
+    result = row_table[r0] | (row_table[r1] << 16) | (row_table[r2] << 32) | (row_table[r3] << 48)
+    return result, score_table[r0] + score_table[r1] + score_table[r2] + score_table[r3]
+
+
+def execute_move(board, direction):
+    """Apply a move to a 64-bit board without mutating anything.
+
+    Returns a tuple of (new_board, score_gain). The move changed the board
+    if and only if new_board != board.
+    """
+    if direction == "left":
+        return _move_rows(board, ROW_LEFT, SCORE_LEFT)
+    if direction == "right":
+        return _move_rows(board, ROW_RIGHT, SCORE_RIGHT)
+    if direction == "up":
+        result, score = _move_rows(transpose(board), ROW_LEFT, SCORE_LEFT)
+        return transpose(result), score
+    if direction == "down":
+        result, score = _move_rows(transpose(board), ROW_RIGHT, SCORE_RIGHT)
+        return transpose(result), score
+    raise ValueError(f"Unknown direction: {direction!r}")
+
+
+def count_empty(board):
+    """Count the empty cells of a 64-bit board."""
+    # Fold each nibble down to a single bit that is set when the cell is occupied
+    board |= board >> 2
+    board |= board >> 1
+    return SIZE * SIZE - bin(board & 0x1111111111111111).count("1")
+
+
+class BitBoard:
+    """4x4 game board backed by a single 64-bit integer.
+
+    Exposes the same moves and queries as utils.game_logic.GameBoard, up
+    to the 32768 tile. grid returns a fresh copy, so writing to its rows
+    changes nothing; assign a whole grid instead. Move tracking and the
+    cell index (track_moves, set_tile, tile_counts) are not supported.
+    """
+
+    def __init__(self, size=SIZE, board=None, rng=None):
+        """Initialize a new bitboard, optionally from an existing packed board.
+
+        rng is the random number generator used for spawning tiles, as for
+        GameBoard.
+        """
+        if size != SIZE:
+            raise ValueError(f"BitBoard only supports {SIZE}x{SIZE} boards")
+        self.size = size
+        self.rng = rng if rng is not None else random.Random()
+        self.board = 0
+        self.score_increment = 0
+
+        if board is None:
+            # Add initial tiles
+            self.add_random_tile()
+            self.add_random_tile()
+        else:
+            self.board = board
+
+    @classmethod
+    def from_grid(cls, grid, rng=None):
+        """Create a bitboard from a list-of-lists of tile values."""
+        return cls(len(grid), board=encode_grid(grid), rng=rng)
+
+    def to_grid(self):
+        """Return the board as a list-of-lists of tile values."""
+        return decode_board(self.board)
+
+    @property
+    def grid(self):
+        """The board as a list-of-lists of tile values.
+
+        This is a fresh copy, so changes to it don't reach the board.
+        """
+        return decode_board(self.board)
+
+    @grid.setter
+    def grid(self, grid):
+        self.board = encode_grid(grid)
+
+    def add_random_tile(self):
+        """Add a random tile (2 or 4) to an empty cell."""
+        empty = count_empty(self.board)
+        if not empty:
+            return False
+
+        target = self.rng.randrange(empty)
+        exponent = 1 if self.rng.random() < 0.9 else 2
+        shift = 0
+        while True:
+            if not (self.board >> shift) & 0xF:
+                if target == 0:
+                    self.board |= exponent << shift
+                    return True
+                target -= 1
+            shift += 4
+
+    def contains_tile(self, value):
+        """Check if the board contains a tile with the given value."""
+        if value == 0:
+            return count_empty(self.board) > 0
+        # Only 2 to 32768 are tiles; exponent 0 would match the empty cells
+        if value < 2 or value & (value - 1) or value > 1 << 15:
+            return False
+
+        exponent = value.bit_length() - 1
+        # XOR turns matching nibbles into zero nibbles, then look for any zero nibble
+        x = self.board ^ (exponent * 0x1111111111111111)
+        x |= x >> 2
+        x |= x >> 1
+        return (x & 0x1111111111111111) != 0x1111111111111111
+
+    def moves_available(self):
+        """Check if any moves are available."""
+        if count_empty(self.board):
+            return True
+
+        # A full board can only move if two neighbours are equal, in which case
+        # either a horizontal or a vertical move changes it
+        for direction in ("left", "up"):
+            if execute_move(self.board, direction)[0] != self.board:
+                return True
+        return False
+
+    def _move(self, direction):
+        """Apply a move in place and record the score gained."""
+        new_board, self.score_increment = execute_move(self.board, direction)
+        if new_board == self.board:
+            return False
+        self.board = new_board
+        return True
+
+    def move_left(self):
+        """Move all tiles to the left and merge if possible."""
+        return self._move("left")
+
+    def move_right(self):
+        """Move all tiles to the right and merge if possible."""
+        return self._move("right")
+
+    def move_up(self):
+        """Move all tiles up and merge if possible."""
+        return self._move("up")
+
+    def move_down(self):
+        """Move all tiles down and merge if possible."""
+        return self._move("down")
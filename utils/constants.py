@@ -41,3 +41,7 @@ COLORS = {
         "tile_super": (60, 58, 50)
     }
 }
+
+# Board sizes the game can be played at
+MIN_GRID_SIZE = 3
+MAX_GRID_SIZE = 16
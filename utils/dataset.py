@@ -0,0 +1,207 @@
+"""
+Memory-mapped datasets of board positions for training evaluation heuristics.
+
+A dataset file is a 16-byte header followed by fixed-width 16-byte
+records, one per move played:
+
+    header:  b"K2048DS\\0" magic, u32 format version, u32 record size
+    record:  u64 board before the move (utils.bitboard layout), u32 score
+             gained by the move, u8 move (an index into
+             utils.replay.DIRECTIONS), u8 terminal flag (the move ended the
+             game), 2 bytes of padding
+
+Records are read through numpy.memmap, so slicing a dataset returns views
+of the file rather than copies and datasets far larger than RAM can be
+used. Only the pages actually touched are read from disk.
+
+NumPy is an optional dependency that is only needed for this module.
+"""
+import os
+import random
+
+import numpy as np
+
+from utils.bitboard import encode_grid
+from utils.replay import read_replays
+
+MAGIC = b"K2048DS\0"
+VERSION = 1
+HEADER_SIZE = 16
+
+RECORD_DTYPE = np.dtype({
+    "names": ["board", "reward", "move", "terminal"],
+    "formats": ["<u8", "<u4", "u1", "u1"],
+    "offsets": [0, 8, 12, 13],
+    "itemsize": 16,
+})
+
+# Records are buffered and written this many at a time
+WRITE_BATCH = 65536
+
+# Rounds of the Feistel network that shuffles minibatches
+FEISTEL_ROUNDS = 4
+
+
+def _header():
+    """Return the file header for the current format."""
+    return MAGIC + np.array([VERSION, RECORD_DTYPE.itemsize], dtype="<u4").tobytes()
+
+
+def _game_records(replay):
+    """Return the records of one 4x4 game as tuples.
+
+    Raises ValueError if a board holds a tile too large to encode.
+    """
+    records = []
+    before = encode_grid(replay.initial_board().grid)
+    last = len(replay.moves) - 1
+    for i, (board, _, gain) in enumerate(replay.positions()):
+        records.append((before, gain, replay.moves[i], i == last and not board.moves_available()))
+        before = encode_grid(board.grid)
+    return records
+
+
+def export_replays(replay_paths, path):
+    """Turn the games in replay files into a dataset file at path.
+
+    Only 4x4 games with tiles up to 32768 fit the 64-bit board layout, so
+    other games are skipped. Returns the number of records written and of
+    games skipped.
+    """
+    buffer = np.zeros(WRITE_BATCH, dtype=RECORD_DTYPE)
+    filled = 0
+    written = 0
+    skipped = 0
+
+    with open(path, "wb") as f:
+        f.write(_header())
+        for replay_path in replay_paths:
+            for replay in read_replays(replay_path):
+                if replay.size != 4:
+                    skipped += 1
+                    continue
+
+                try:
+                    records = _game_records(replay)
+                except ValueError:
+                    skipped += 1
+                    continue
+
+                for record in records:
+                    buffer[filled] = record
+                    filled += 1
+                    if filled == WRITE_BATCH:
+                        buffer.tofile(f)
+                        written += filled
+                        filled = 0
+
+        buffer[:filled].tofile(f)
+        written += filled
+    return written, skipped
+
+
+def _feistel(values, half_bits, keys):
+    """Apply a balanced Feistel network to values of 2 * half_bits bits."""
+    mask = np.uint64((1 << half_bits) - 1)
+    shift = np.uint64(64 - half_bits)
+    left = values >> np.uint64(half_bits)
+    right = values & mask
+    for key in keys:
+        # Multiplicative hashing: the top bits of the product mix every key bit
+        mixed = ((right ^ np.uint64(key)) * np.uint64(0x9E3779B97F4A7C15)) >> shift
+        left, right = right, left ^ (mixed & mask)
+    return (left << np.uint64(half_bits)) | right
+
+
+def _permute(positions, count, keys):
+    """Map positions in [0, count) to a pseudo-random permutation of [0, count).
+
+    A Feistel network is a permutation of the smallest power-of-four range
+    covering count, whatever its round function. Values that land outside
+    [0, count) are sent through it again (cycle walking) until they land
+    inside, which keeps the result a permutation of [0, count).
+    """
+    half_bits = max(1, ((count - 1).bit_length() + 1) // 2)
+    values = _feistel(positions, half_bits, keys)
+    outside = values >= np.uint64(count)
+    while outside.any():
+        values[outside] = _feistel(values[outside], half_bits, keys)
+        outside = values >= np.uint64(count)
+    return values
+
+
+def unpack_boards(boards):
+    """Unpack 64-bit boards into an (N, 16) array of tile exponents (0 = empty)."""
+    shifts = np.arange(0, 64, 4, dtype=np.uint64)
+    return ((np.asarray(boards, dtype=np.uint64)[:, None] >> shifts) & np.uint64(0xF)).astype(np.uint8)
+
+
+class PositionDataset:
+    """Read-only view of a dataset file through numpy.memmap."""
+
+    def __init__(self, path):
+        """Map the dataset file at path."""
+        with open(path, "rb") as f:
+            header = f.read(HEADER_SIZE)
+        if len(header) != HEADER_SIZE or header[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a position dataset")
+        version, record_size = np.frombuffer(header, dtype="<u4", offset=len(MAGIC))
+        if version != VERSION or record_size != RECORD_DTYPE.itemsize:
+            raise ValueError(f"unsupported dataset version {version}")
+
+        self.path = path
+        if os.path.getsize(path) > HEADER_SIZE:
+            self.records = np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=HEADER_SIZE)
+        else:
+            # An empty file can't be mapped
+            self.records = np.zeros(0, dtype=RECORD_DTYPE)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, index):
+        """Index or slice the records; slices are views of the file."""
+        return self.records[index]
+
+    @property
+    def boards(self):
+        """The boards of every record, as a view of the file."""
+        return self.records["board"]
+
+    @property
+    def moves(self):
+        """The moves of every record, as a view of the file."""
+        return self.records["move"]
+
+    @property
+    def rewards(self):
+        """The score gains of every record, as a view of the file."""
+        return self.records["reward"]
+
+    @property
+    def terminals(self):
+        """The terminal flags of every record, as a view of the file."""
+        return self.records["terminal"]
+
+    def minibatches(self, batch_size, seed=None, drop_last=False):
+        """Yield the records in shuffled minibatches, each record once per pass.
+
+        The order is a pseudo-random permutation of the record indices,
+        computed a batch at a time (see _permute), so it needs no memory
+        however large the dataset is. Each batch's indices are sorted
+        before reading, so a batch is one forward sweep over the file.
+        Batches are copies, not views.
+        """
+        count = len(self.records)
+        if count == 0:
+            return
+        rng = random.Random(seed)
+        keys = [rng.getrandbits(64) for _ in range(FEISTEL_ROUNDS)]
+
+        for start in range(0, count, batch_size):
+            stop = min(start + batch_size, count)
+            if drop_last and stop - start < batch_size:
+                return
+            indices = _permute(np.arange(start, stop, dtype=np.uint64), count, keys)
+            indices.sort()
+            yield self.records[indices.astype(np.int64)]
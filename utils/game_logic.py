@@ -2,179 +2,382 @@
 Game logic for the 2048 game.
 """
 import random
+from bisect import bisect_right
+from itertools import accumulate
+
+
+def merge_line(line, merged=None):
+    """Slide and merge a single row or column towards its start.
+    
+    This is the one kernel behind every move: tiles are compacted, adjacent
+    equal pairs are merged once each from the front, and the result is padded
+    with empty cells. Returns a tuple of (new_line, score_gain). If merged is
+    a list, the new value of each merged tile is appended to it.
+    """
+    tiles = [tile for tile in line if tile != 0]
+    new_line = []
+    score = 0
+    i = 0
+    while i < len(tiles):
+        if i + 1 < len(tiles) and tiles[i] == tiles[i + 1]:
+            new_line.append(tiles[i] * 2)
+            score += tiles[i] * 2
+            if merged is not None:
+                merged.append(tiles[i] * 2)
+            i += 2
+        else:
+            new_line.append(tiles[i])
+            i += 1
+    
+    new_line += [0] * (len(line) - len(new_line))
+    return new_line, score
+
+
+def line_movements(line):
+    """Work out where each tile of a line goes when it slides towards its start.
+    
+    Follows the same rules as merge_line. Returns a list of
+    (from_index, to_index, value, merged) tuples, one per tile, where value
+    is the tile's value before the move and merged tells whether it merged
+    with another tile at to_index.
+    """
+    tiles = [(index, tile) for index, tile in enumerate(line) if tile != 0]
+    movements = []
+    target = 0
+    i = 0
+    while i < len(tiles):
+        index, tile = tiles[i]
+        if i + 1 < len(tiles) and tile == tiles[i + 1][1]:
+            movements.append((index, target, tile, True))
+            movements.append((tiles[i + 1][0], target, tile, True))
+            i += 2
+        else:
+            movements.append((index, target, tile, False))
+            i += 1
+        target += 1
+    return movements
+
+
+class TileMove:
+    """One tile's movement in a move: where it came from and where it landed."""
+    
+    __slots__ = ("from_row", "from_col", "to_row", "to_col", "value", "merged")
+    
+    def __init__(self, from_row, from_col, to_row, to_col, value, merged):
+        self.from_row = from_row
+        self.from_col = from_col
+        self.to_row = to_row
+        self.to_col = to_col
+        self.value = value
+        self.merged = merged
+    
+    def __iter__(self):
+        return iter((self.from_row, self.from_col, self.to_row, self.to_col, self.value, self.merged))
+    
+    def __eq__(self, other):
+        return isinstance(other, TileMove) and tuple(self) == tuple(other)
+    
+    def __repr__(self):
+        return "TileMove(%d, %d, %d, %d, %d, %s)" % tuple(self)
+
+
+class MoveDiff:
+    """Everything a move changed on the board.
+    
+    moves holds a TileMove for each tile that slid or merged (tiles that
+    stayed put are left out), score is the points gained and spawn is the
+    (row, col, value) of the tile added after the move, or None.
+    """
+    
+    __slots__ = ("direction", "moves", "score", "spawn")
+    
+    def __init__(self, direction=None):
+        self.direction = direction
+        self.moves = []
+        self.score = 0
+        self.spawn = None
+    
+    def merges(self):
+        """Return (row, col, value) for each merged tile, with its new value."""
+        merges = {}
+        for move in self.moves:
+            if move.merged:
+                merges[(move.to_row, move.to_col)] = move.value * 2
+        return [(row, col, value) for (row, col), value in merges.items()]
+    
+    def changed_cells(self):
+        """Return the set of (row, col) cells whose value the move changed."""
+        cells = set()
+        for move in self.moves:
+            cells.add((move.from_row, move.from_col))
+            cells.add((move.to_row, move.to_col))
+        if self.spawn is not None:
+            cells.add(self.spawn[:2])
+        return cells
+    
+    def flatten(self, size):
+        """Pack the diff into a flat list of ints, for logging or sending.
+        
+        Cells are flat indices row * size + col. The layout is
+        [score, spawn_index, spawn_value, then from, to, value, merged for
+        each tile move], with -1 and 0 for the spawn when there is none.
+        """
+        if self.spawn is None:
+            flat = [self.score, -1, 0]
+        else:
+            row, col, value = self.spawn
+            flat = [self.score, row * size + col, value]
+        for move in self.moves:
+            flat += (
+                move.from_row * size + move.from_col,
+                move.to_row * size + move.to_col,
+                move.value,
+                int(move.merged),
+            )
+        return flat
+
 
 class GameBoard:
-    def __init__(self, size):
-        """Initialize a new game board with the given size."""
+    def __init__(self, size, rng=None):
+        """Initialize a new game board with the given size.
+        
+        rng is the random number generator used for spawning tiles, such as a
+        seeded random.Random. Each board gets its own unseeded generator by
+        default, so boards never share the global random state.
+        """
         self.size = size
+        self.rng = rng if rng is not None else random.Random()
         self.grid = [[0 for _ in range(size)] for _ in range(size)]
         self.score_increment = 0
         
+        # When enabled, every move records what it changed as a MoveDiff in
+        # last_diff, including the tile spawned after it
+        self.track_moves = False
+        self.last_diff = None
+        
         # Add initial tiles
         self.add_random_tile()
         self.add_random_tile()
     
+    @property
+    def grid(self):
+        """The tile values as a list of rows.
+        
+        Assigning a new grid rebuilds the cell index. Writing to the rows
+        directly bypasses it, so use set_tile for single cells instead.
+        """
+        return self._grid
+    
+    @grid.setter
+    def grid(self, grid):
+        self._grid = grid
+        self.reindex()
+    
+    def reindex(self):
+        """Rebuild the empty-cell index and tile histogram from the grid."""
+        # Empty cells are indexed by how many each row holds. A move only
+        # recounts the rows it changed, with one list.count per row, and a
+        # spawn finds the k-th empty cell in row-major order from the running
+        # totals of the counts instead of visiting every cell
+        self._empty_rows = [row.count(0) for row in self._grid]
+        self._empty_count = sum(self._empty_rows)
+        self.tile_counts = {}
+        
+        for row in self._grid:
+            for value in row:
+                if value != 0:
+                    self.tile_counts[value] = self.tile_counts.get(value, 0) + 1
+    
+    def _count_merges(self, merged):
+        """Update the tile histogram for the merged tiles of a move.
+        
+        Sliding keeps every tile, so only merges change the histogram: each
+        one turns two tiles of half its value into one tile of its value.
+        """
+        counts = self.tile_counts
+        for value in merged:
+            counts[value] = counts.get(value, 0) + 1
+            counts[value // 2] -= 2
+        for value in merged:
+            if counts.get(value // 2) == 0:
+                del counts[value // 2]
+    
+    def set_tile(self, row, col, value):
+        """Set a single cell, keeping the cell index up to date."""
+        counts = self.tile_counts
+        old = self._grid[row][col]
+        if old == value:
+            return
+        self._grid[row][col] = value
+        if old == 0:
+            self._empty_rows[row] -= 1
+            self._empty_count -= 1
+        elif counts[old] == 1:
+            del counts[old]
+        else:
+            counts[old] -= 1
+        
+        if value == 0:
+            self._empty_rows[row] += 1
+            self._empty_count += 1
+        else:
+            counts[value] = counts.get(value, 0) + 1
+    
+    @property
+    def empty_count(self):
+        """Number of empty cells on the board."""
+        return self._empty_count
+    
     def add_random_tile(self):
-        """Add a random tile (2 or 4) to an empty cell."""
-        empty_cells = []
-        for row in range(self.size):
-            for col in range(self.size):
-                if self.grid[row][col] == 0:
-                    empty_cells.append((row, col))
+        """Add a random tile (2 or 4) to an empty cell.
         
-        if empty_cells:
-            row, col = random.choice(empty_cells)
-            self.grid[row][col] = 2 if random.random() < 0.9 else 4
-            return True
-        return False
+        The cell is the k-th empty one in row-major order, so the spawn only
+        depends on the grid and the generator state. A board rebuilt from a
+        saved grid and generator state spawns exactly where the original would.
+        """
+        if not self._empty_count:
+            return False
+        
+        # Find the row holding the k-th empty cell, then the cell in that row
+        k = self.rng.randrange(self._empty_count)
+        totals = list(accumulate(self._empty_rows))
+        row = bisect_right(totals, k)
+        if row:
+            k -= totals[row - 1]
+        line = self._grid[row]
+        col = line.index(0)
+        for _ in range(k):
+            col = line.index(0, col + 1)
+        
+        value = 2 if self.rng.random() < 0.9 else 4
+        line[col] = value
+        self._empty_rows[row] -= 1
+        self._empty_count -= 1
+        self.tile_counts[value] = self.tile_counts.get(value, 0) + 1
+        if self.track_moves and self.last_diff is not None:
+            self.last_diff.spawn = (row, col, value)
+        return True
     
     def contains_tile(self, value):
         """Check if the board contains a tile with the given value."""
-        for row in range(self.size):
-            for col in range(self.size):
-                if self.grid[row][col] == value:
-                    return True
-        return False
+        if value == 0:
+            return self._empty_count > 0
+        return value in self.tile_counts
     
     def moves_available(self):
         """Check if any moves are available."""
         # Check for empty cells
-        for row in range(self.size):
-            for col in range(self.size):
-                if self.grid[row][col] == 0:
-                    return True
+        if self._empty_count:
+            return True
         
         # Check for adjacent cells with the same value
+        grid = self._grid
         for row in range(self.size):
             for col in range(self.size):
-                value = self.grid[row][col]
+                value = grid[row][col]
                 
                 # Check right
-                if col < self.size - 1 and self.grid[row][col + 1] == value:
+                if col < self.size - 1 and grid[row][col + 1] == value:
                     return True
                 
                 # Check down
-                if row < self.size - 1 and self.grid[row + 1][col] == value:
+                if row < self.size - 1 and grid[row + 1][col] == value:
                     return True
         
         return False
     
-    def move_left(self):
-        """Move all tiles to the left and merge if possible."""
+    def _record_movements(self, line, reverse, cell):
+        """Add the tile movements of a changed line to last_diff.
+        
+        cell maps a position along the line to its (row, col).
+        """
+        last = self.size - 1
+        moves = self.last_diff.moves
+        for source, target, value, merged in line_movements(line[::-1] if reverse else line):
+            if reverse:
+                source, target = last - source, last - target
+            if source != target or merged:
+                moves.append(TileMove(*cell(source), *cell(target), value, merged))
+    
+    def _move_rows(self, reverse, direction=None):
+        """Slide and merge every row, reporting whether anything moved."""
         moved = False
         self.score_increment = 0
+        size = self.size
+        merged = []
+        if self.track_moves:
+            self.last_diff = MoveDiff(direction)
         
-        for row in range(self.size):
-            # Compact non-zero tiles to the left
-            new_row = [tile for tile in self.grid[row] if tile != 0]
-            new_row += [0] * (self.size - len(new_row))
+        for row in range(size):
+            line = self._grid[row]
+            new_line, gain = merge_line(line[::-1] if reverse else line, merged)
+            if reverse:
+                new_line.reverse()
             
-            # Merge adjacent tiles with the same value
-            for i in range(self.size - 1):
-                if new_row[i] != 0 and new_row[i] == new_row[i + 1]:
-                    new_row[i] *= 2
-                    self.score_increment += new_row[i]
-                    new_row[i + 1] = 0
-            
-            # Compact again after merging
-            new_row = [tile for tile in new_row if tile != 0]
-            new_row += [0] * (self.size - len(new_row))
-            
-            # Check if the row changed
-            if new_row != self.grid[row]:
+            # Only rows that actually changed are written back
+            if new_line != line:
                 moved = True
-                self.grid[row] = new_row
+                self.score_increment += gain
+                if self.track_moves:
+                    self._record_movements(line, reverse, lambda col, row=row: (row, col))
+                self._grid[row] = new_line
+                empty = new_line.count(0)
+                self._empty_count += empty - self._empty_rows[row]
+                self._empty_rows[row] = empty
         
+        if merged:
+            self._count_merges(merged)
+        if self.track_moves:
+            self.last_diff.score = self.score_increment
         return moved
     
-    def move_right(self):
-        """Move all tiles to the right and merge if possible."""
+    def _move_columns(self, reverse, direction=None):
+        """Slide and merge every column, reporting whether anything moved."""
         moved = False
         self.score_increment = 0
+        size = self.size
+        grid = self._grid
+        merged = []
+        if self.track_moves:
+            self.last_diff = MoveDiff(direction)
         
-        for row in range(self.size):
-            # Compact non-zero tiles to the right
-            new_row = [tile for tile in self.grid[row] if tile != 0]
-            new_row = [0] * (self.size - len(new_row)) + new_row
-            
-            # Merge adjacent tiles with the same value (from right to left)
-            for i in range(self.size - 1, 0, -1):
-                if new_row[i] != 0 and new_row[i] == new_row[i - 1]:
-                    new_row[i] *= 2
-                    self.score_increment += new_row[i]
-                    new_row[i - 1] = 0
+        for col in range(size):
+            line = [grid[row][col] for row in range(size)]
+            new_line, gain = merge_line(line[::-1] if reverse else line, merged)
+            if reverse:
+                new_line.reverse()
             
-            # Compact again after merging
-            new_row = [tile for tile in new_row if tile != 0]
-            new_row = [0] * (self.size - len(new_row)) + new_row
-            
-            # Check if the row changed
-            if new_row != self.grid[row]:
+            # Only columns that actually changed are written back
+            if new_line != line:
                 moved = True
-                self.grid[row] = new_row
+                self.score_increment += gain
+                if self.track_moves:
+                    self._record_movements(line, reverse, lambda row, col=col: (row, col))
+                for row in range(size):
+                    grid[row][col] = new_line[row]
         
+        # A column move can change every row, so all of them are recounted
+        if moved:
+            self._empty_rows = [row.count(0) for row in grid]
+            self._empty_count = sum(self._empty_rows)
+        if merged:
+            self._count_merges(merged)
+        if self.track_moves:
+            self.last_diff.score = self.score_increment
         return moved
     
+    def move_left(self):
+        """Move all tiles to the left and merge if possible."""
+        return self._move_rows(reverse=False, direction="left")
+    
+    def move_right(self):
+        """Move all tiles to the right and merge if possible."""
+        return self._move_rows(reverse=True, direction="right")
+    
     def move_up(self):
         """Move all tiles up and merge if possible."""
-        moved = False
-        self.score_increment = 0
-        
-        for col in range(self.size):
-            # Extract column
-            column = [self.grid[row][col] for row in range(self.size)]
-            
-            # Compact non-zero tiles to the top
-            new_column = [tile for tile in column if tile != 0]
-            new_column += [0] * (self.size - len(new_column))
-            
-            # Merge adjacent tiles with the same value
-            for i in range(self.size - 1):
-                if new_column[i] != 0 and new_column[i] == new_column[i + 1]:
-                    new_column[i] *= 2
-                    self.score_increment += new_column[i]
-                    new_column[i + 1] = 0
-            
-            # Compact again after merging
-            new_column = [tile for tile in new_column if tile != 0]
-            new_column += [0] * (self.size - len(new_column))
-            
-            # Check if the column changed
-            if new_column != column:
-                moved = True
-                for row in range(self.size):
-                    self.grid[row][col] = new_column[row]
-        
-        return moved
+        return self._move_columns(reverse=False, direction="up")
     
     def move_down(self):
         """Move all tiles down and merge if possible."""
-        moved = False
-        self.score_increment = 0
-        
-        for col in range(self.size):
-            # Extract column
-            column = [self.grid[row][col] for row in range(self.size)]
-            
-            # Compact non-zero tiles to the bottom
-            new_column = [tile for tile in column if tile != 0]
-            new_column = [0] * (self.size - len(new_column)) + new_column
-            
-            # Merge adjacent tiles with the same value (from bottom to top)
-            for i in range(self.size - 1, 0, -1):
-                if new_column[i] != 0 and new_column[i] == new_column[i - 1]:
-                    new_column[i] *= 2
-                    self.score_increment += new_column[i]
-                    new_column[i - 1] = 0
-            
-            # Compact again after merging
-            new_column = [tile for tile in new_column if tile != 0]
-            new_column = [0] * (self.size - len(new_column)) + new_column
-            
-            # Check if the column changed
-            if new_column != column:
-                moved = True
-                for row in range(self.size):
-                    self.grid[row][col] = new_column[row]
-        
-        return moved
+        return self._move_columns(reverse=True, direction="down")
@@ -0,0 +1,80 @@
+"""
+Undo and redo history for the 2048 game.
+
+Each entry is an immutable snapshot of the board packed into bytes by
+utils.packed.pack_grid, one byte per cell holding the tile's exponent,
+with the rest of the game state, such as the score, alongside. A snapshot
+of a 4x4 board takes 16 bytes, so the history can be long without costing
+much memory. Undoing or redoing a step moves one snapshot between two
+stacks, however long the history is.
+"""
+from collections import deque
+
+
+class History:
+    """Undo and redo stacks of snapshots, tuples starting with a packed grid.
+
+    With max_bytes, the oldest undo steps are dropped once the snapshots
+    held take more than that many bytes. By default the history is unbounded.
+    """
+
+    def __init__(self, max_bytes=None):
+        """Initialize an empty history."""
+        self.max_bytes = max_bytes
+        self.undo_stack = deque()
+        self.redo_stack = []
+        self.bytes = 0
+
+    @property
+    def can_undo(self):
+        """Whether there is a step to undo."""
+        return bool(self.undo_stack)
+
+    @property
+    def can_redo(self):
+        """Whether there is an undone step to redo."""
+        return bool(self.redo_stack)
+
+    def record(self, state):
+        """Record the state before a move, which discards the steps that were undone."""
+        for undone in self.redo_stack:
+            self.bytes -= len(undone[0])
+        self.redo_stack.clear()
+        self.undo_stack.append(state)
+        self.bytes += len(state[0])
+        self._evict()
+
+    def _evict(self):
+        """Drop the oldest undo steps until the history fits in max_bytes."""
+        if self.max_bytes is None:
+            return
+        while self.bytes > self.max_bytes and self.undo_stack:
+            self.bytes -= len(self.undo_stack.popleft()[0])
+
+    def undo(self, current):
+        """Step back from the current state, returning the previous one or None."""
+        if not self.undo_stack:
+            return None
+        self.redo_stack.append(current)
+        self.bytes += len(current[0])
+        state = self.undo_stack.pop()
+        self.bytes -= len(state[0])
+        self._evict()
+        return state
+
+    def redo(self, current):
+        """Step forward from the current state, returning the next one or None."""
+        if not self.redo_stack:
+            return None
+        self.undo_stack.append(current)
+        self.bytes += len(current[0])
+        state = self.redo_stack.pop()
+        self.bytes -= len(state[0])
+        self._evict()
+        return state
+
+    def clear(self):
+        """Forget every step."""
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+        self.bytes = 0
@@ -0,0 +1,137 @@
+"""
+Precomputed row-transition tables for the 2048 bitboard engine.
+
+A 4-cell row of 4-bit exponents has only 65,536 possible states, so every
+slide-and-merge result is computed once and then looked up. For each encoded
+row the tables hold the resulting row, the score gained and whether the row
+changed, for both the left and the right direction. Columns reuse the same
+tables by transposing the board (see utils.bitboard).
+
+The tables are built on first import and cached to a binary file under
+__pycache__ so later processes can load them in a few milliseconds.
+"""
+import os
+import sys
+from array import array
+
+ROW_STATES = 1 << 16
+CACHE_VERSION = 1
+CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "__pycache__",
+    f"move_tables.v{CACHE_VERSION}.bin",
+)
+
+
+def slide_row_left(row):
+    """Slide and merge a 16-bit row to the left without using the tables.
+
+    Returns a tuple of (new_row, score_gain). Two 32768 tiles (exponent 15)
+    do not merge, since the result would not fit in a nibble.
+    """
+    tiles = [(row >> shift) & 0xF for shift in (0, 4, 8, 12)]
+    tiles = [tile for tile in tiles if tile]
+    merged = []
+    score = 0
+    i = 0
+    while i < len(tiles):
+        if i + 1 < len(tiles) and tiles[i] == tiles[i + 1] and tiles[i] < 15:
+            merged.append(tiles[i] + 1)
+            score += 1 << (tiles[i] + 1)
+            i += 2
+        else:
+            merged.append(tiles[i])
+            i += 1
+
+    result = 0
+    for shift, tile in zip((0, 4, 8, 12), merged):
+        result |= tile << shift
+    return result, score
+
+
+def reverse_row(row):
+    """Reverse the order of the four cells in a 16-bit row."""
+    return ((row >> 12) | ((row >> 4) & 0x00F0) | ((row << 4) & 0x0F00) | (row << 12)) & 0xFFFF
+
+
+def build_tables():
+    """Compute all row-transition tables from scratch.
+
+    Returns a tuple of (row_left, row_right, score_left, score_right,
+    changed_left, changed_right).
+    """
+    row_left = array("H", bytes(2 * ROW_STATES))
+    row_right = array("H", bytes(2 * ROW_STATES))
+    score_left = array("I", bytes(4 * ROW_STATES))
+    score_right = array("I", bytes(4 * ROW_STATES))
+    changed_left = bytearray(ROW_STATES)
+    changed_right = bytearray(ROW_STATES)
+
+    for row in range(ROW_STATES):
+        result, score = slide_row_left(row)
+        row_left[row] = result
+        score_left[row] = score
+        changed_left[row] = result != row
+
+        # Moving right is moving the mirrored row left
+        mirrored = reverse_row(row)
+        result = reverse_row(result)
+        row_right[mirrored] = result
+        score_right[mirrored] = score
+        changed_right[mirrored] = result != mirrored
+
+    return row_left, row_right, score_left, score_right, changed_left, changed_right
+
+
+def _save_tables(tables, path):
+    """Write the tables to a cache file atomically."""
+    row_left, row_right, score_left, score_right, changed_left, changed_right = tables
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            f.write(sys.byteorder.encode("ascii").ljust(8, b"\0"))
+            for table in (row_left, row_right, score_left, score_right):
+                table.tofile(f)
+            f.write(changed_left)
+            f.write(changed_right)
+        os.replace(tmp_path, path)
+    except OSError:
+        # Caching is only an optimisation; a read-only install still works
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def _load_tables(path):
+    """Read the tables from a cache file, returning None if it is unusable."""
+    try:
+        with open(path, "rb") as f:
+            if f.read(8).rstrip(b"\0") != sys.byteorder.encode("ascii"):
+                return None
+            tables = []
+            for typecode in ("H", "H", "I", "I"):
+                table = array(typecode)
+                table.fromfile(f, ROW_STATES)
+                tables.append(table)
+            for _ in range(2):
+                changed = bytearray(f.read(ROW_STATES))
+                if len(changed) != ROW_STATES:
+                    return None
+                tables.append(changed)
+            return tuple(tables)
+    except (OSError, EOFError):
+        return None
+
+
+def load_tables(path=CACHE_PATH):
+    """Load the tables from the cache file, building and caching them if needed."""
+    tables = _load_tables(path)
+    if tables is None:
+        tables = build_tables()
+        _save_tables(tables, path)
+    return tables
+
+
+ROW_LEFT, ROW_RIGHT, SCORE_LEFT, SCORE_RIGHT, CHANGED_LEFT, CHANGED_RIGHT = load_tables()
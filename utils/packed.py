@@ -0,0 +1,214 @@
+"""
+Packed game board of any size for the 2048 game.
+
+The board is stored as an immutable bytes object with one byte per cell,
+in row-major order, holding the log2 exponent of its tile (0 means empty),
+so tiles up to 2**255 fit. Rows are slices of it, columns strided slices,
+and empty cells are dropped with bytes.replace.
+
+Sliding a line only depends on its contents. On boards of up to
+TABLE_MAX_SIZE cells a side there are few distinct lines, so each result
+is computed once and kept in a lookup table keyed by the line's bytes.
+Larger boards merge every line in a Python loop over its tiles, so only
+the slicing and compaction run in C. Either way a move costs time in
+proportion to the number of cells. To move many boards at once in
+vectorized code, use utils.batch.BatchBoard instead.
+"""
+import random
+
+# Lines of boards up to this size are looked up in a table
+TABLE_MAX_SIZE = 4
+
+_LINE_TABLES = {}
+
+
+def pack_grid(grid):
+    """Pack a grid of tile values into bytes of tile exponents."""
+    return bytes(value.bit_length() - 1 if value else 0 for row in grid for value in row)
+
+
+def unpack_grid(data, size):
+    """Unpack bytes written by pack_grid into a grid of tile values."""
+    values = [1 << exponent if exponent else 0 for exponent in data]
+    return [values[row * size:(row + 1) * size] for row in range(size)]
+
+
+def slide_line(line):
+    """Slide and merge a line of exponents towards its start.
+
+    Follows the same rules as utils.game_logic.merge_line. Returns a tuple
+    of (new_line, score_gain) with new_line as bytes.
+    """
+    tiles = line.replace(b"\0", b"")
+    merged = bytearray()
+    score = 0
+    i = 0
+    count = len(tiles)
+    while i < count:
+        tile = tiles[i]
+        if i + 1 < count and tiles[i + 1] == tile:
+            merged.append(tile + 1)
+            score += 1 << (tile + 1)
+            i += 2
+        else:
+            merged.append(tile)
+            i += 1
+    return bytes(merged) + bytes(len(line) - len(merged)), score
+
+
+def line_table(size):
+    """Return the lookup table for lines of a size, or None if they don't get one."""
+    if size > TABLE_MAX_SIZE:
+        return None
+    return _LINE_TABLES.setdefault(size, {})
+
+
+class PackedBoard:
+    """Game board of any size backed by a bytes object of tile exponents.
+
+    Has the same moves, spawns and board queries as
+    utils.game_logic.GameBoard, but not its move tracking (track_moves,
+    last_diff) or cell index (set_tile, tile_counts, empty_count).
+    utils.simulation plays unrecorded games on it for the sizes that have
+    line tables.
+    """
+
+    def __init__(self, size, cells=None, rng=None):
+        """Initialize a new board, optionally from existing packed cells.
+
+        rng is the random number generator used for spawning tiles, as for
+        GameBoard.
+        """
+        self.size = size
+        self.rng = rng if rng is not None else random.Random()
+        self.table = line_table(size)
+        self.score_increment = 0
+
+        if cells is None:
+            self.cells = bytes(size * size)
+            # Add initial tiles
+            self.add_random_tile()
+            self.add_random_tile()
+        else:
+            self.cells = bytes(cells)
+
+    @classmethod
+    def from_grid(cls, grid, rng=None):
+        """Create a board from a list-of-lists of tile values."""
+        return cls(len(grid), cells=pack_grid(grid), rng=rng)
+
+    def to_grid(self):
+        """Return the board as a list-of-lists of tile values."""
+        return unpack_grid(self.cells, self.size)
+
+    @property
+    def grid(self):
+        """The board as a list-of-lists of tile values (a fresh copy)."""
+        return unpack_grid(self.cells, self.size)
+
+    @grid.setter
+    def grid(self, grid):
+        self.cells = pack_grid(grid)
+
+    def _slide(self, line):
+        """Slide a line towards its start, through the lookup table if there is one."""
+        table = self.table
+        if table is None:
+            return slide_line(line)
+        result = table.get(line)
+        if result is None:
+            result = table[line] = slide_line(line)
+        return result
+
+    def _rows(self):
+        """Return the rows as bytes."""
+        size = self.size
+        cells = self.cells
+        return [cells[start:start + size] for start in range(0, size * size, size)]
+
+    def _columns(self):
+        """Return the columns as bytes."""
+        size = self.size
+        cells = self.cells
+        return [cells[col::size] for col in range(size)]
+
+    def add_random_tile(self):
+        """Add a random tile (2 or 4) to an empty cell."""
+        cells = self.cells
+        empty = cells.count(0)
+        if not empty:
+            return False
+
+        target = self.rng.randrange(empty)
+        exponent = 1 if self.rng.random() < 0.9 else 2
+        index = cells.index(0)
+        for _ in range(target):
+            index = cells.index(0, index + 1)
+        self.cells = cells[:index] + bytes((exponent,)) + cells[index + 1:]
+        return True
+
+    def contains_tile(self, value):
+        """Check if the board contains a tile with the given value."""
+        if value == 0:
+            return 0 in self.cells
+        # Exponent 0 marks empty cells, so 1 is never a tile
+        if value < 2 or value & (value - 1) or value.bit_length() > 256:
+            return False
+        return value.bit_length() - 1 in self.cells
+
+    def moves_available(self):
+        """Check if any moves are available."""
+        if 0 in self.cells:
+            return True
+
+        # A full board can only move if two neighbours are equal, in which case
+        # either a horizontal or a vertical move changes it
+        slide = self._slide
+        for line in self._rows() + self._columns():
+            if slide(line)[0] != line:
+                return True
+        return False
+
+    def _move(self, lines, reverse, columns):
+        """Slide every line, apply the result in place and record the score gained."""
+        slide = self._slide
+        score = 0
+        moved_lines = []
+        for line in lines:
+            if reverse:
+                new_line, gain = slide(line[::-1])
+                new_line = new_line[::-1]
+            else:
+                new_line, gain = slide(line)
+            score += gain
+            moved_lines.append(new_line)
+
+        if columns:
+            cells = bytearray(len(self.cells))
+            for col, line in enumerate(moved_lines):
+                cells[col::self.size] = line
+            cells = bytes(cells)
+        else:
+            cells = b"".join(moved_lines)
+
+        self.score_increment = score
+        if cells == self.cells:
+            return False
+        self.cells = cells
+        return True
+
+    def move_left(self):
+        """Move all tiles to the left and merge if possible."""
+        return self._move(self._rows(), reverse=False, columns=False)
+
+    def move_right(self):
+        """Move all tiles to the right and merge if possible."""
+        return self._move(self._rows(), reverse=True, columns=False)
+
+    def move_up(self):
+        """Move all tiles up and merge if possible."""
+        return self._move(self._columns(), reverse=False, columns=True)
+
+    def move_down(self):
+        """Move all tiles down and merge if possible."""
+        return self._move(self._columns(), reverse=True, columns=True)
@@ -0,0 +1,107 @@
+"""
+Crash-safe persistence for the 2048 game.
+
+Files are written to a temporary file next to the target and renamed over
+it, so a crash or kill mid-write leaves the previous version intact rather
+than a truncated file. Autosaves are debounced and written on a background
+thread, so saving never stalls a frame.
+"""
+import json
+import os
+import threading
+import time
+
+
+def atomic_write_json(path, data):
+    """Write data as JSON to path, replacing the file atomically."""
+    directory = os.path.dirname(os.path.abspath(path))
+    tmp_path = os.path.join(directory, f".{os.path.basename(path)}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def load_json(path):
+    """Load a JSON file, returning None if it is missing or unreadable."""
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+class Autosaver:
+    """Writes the latest saved data to a file from a background thread.
+
+    save() only stores the data and wakes the thread, which waits for delay
+    seconds so a burst of saves becomes a single write of the last one.
+    """
+
+    def __init__(self, path, delay=1.0):
+        """Initialize an autosaver writing to path."""
+        self.path = path
+        self.delay = delay
+        self.pending = None
+        self.writes = 0
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._thread = None
+        self._closed = False
+
+    def save(self, data):
+        """Schedule data to be written; it must not be modified afterwards."""
+        with self._condition:
+            self.pending = data
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def _run(self):
+        """Write pending data, at most once per delay."""
+        while True:
+            with self._condition:
+                while self.pending is None and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                # Let further saves replace the data before writing it
+                deadline = time.monotonic() + self.delay
+                while not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                if self._closed:
+                    return
+            self.flush()
+
+    def flush(self):
+        """Write any pending data now, on the calling thread."""
+        with self._write_lock:
+            with self._condition:
+                data, self.pending = self.pending, None
+            if data is not None:
+                try:
+                    atomic_write_json(self.path, data)
+                    self.writes += 1
+                except OSError as error:
+                    print(f"Could not save {self.path}: {error}")
+
+    def close(self):
+        """Stop the background thread and write any pending data."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
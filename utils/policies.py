@@ -0,0 +1,68 @@
+"""
+Move policies for playing the 2048 game without a human.
+
+A policy is a callable that takes a board (GameBoard or BitBoard) and
+returns the direction to move in, or None when it has no opinion.
+"""
+import functools
+import random
+
+from utils.game_logic import merge_line
+
+DIRECTIONS = ("up", "down", "left", "right")
+POLICIES = ("random", "greedy", "expectimax")
+
+
+def preview_move(grid, direction):
+    """Work out what a move would do to a grid without changing it.
+
+    Returns a tuple of (moved, score_gain).
+    """
+    if direction in ("left", "right"):
+        lines = grid
+    else:
+        lines = [list(column) for column in zip(*grid)]
+
+    moved = False
+    score = 0
+    for line in lines:
+        source = line[::-1] if direction in ("right", "down") else line
+        new_line, gain = merge_line(source)
+        if new_line != source:
+            moved = True
+            score += gain
+    return moved, score
+
+
+def random_policy(board, rng=random):
+    """Pick any direction at random."""
+    return rng.choice(DIRECTIONS)
+
+
+def greedy_policy(board):
+    """Pick the move that scores the most right now, preferring earlier directions on ties."""
+    grid = board.grid
+    best_direction = None
+    best_score = -1
+    for direction in DIRECTIONS:
+        moved, score = preview_move(grid, direction)
+        if moved and score > best_score:
+            best_direction, best_score = direction, score
+    return best_direction
+
+
+def make_policy(name, depth=2, time_limit=None, rng=None):
+    """Create a policy by name.
+
+    rng only applies to the random policy. depth and time_limit only apply
+    to the expectimax policy; leaving time_limit as None searches to a fixed
+    depth, which keeps results reproducible across machines.
+    """
+    if name == "random":
+        return functools.partial(random_policy, rng=rng if rng is not None else random.Random())
+    if name == "greedy":
+        return greedy_policy
+    if name == "expectimax":
+        from utils.ai import ExpectimaxAI
+        return ExpectimaxAI(max_depth=depth, time_limit=time_limit).best_move
+    raise ValueError(f"Unknown policy: {name!r} (expected one of {', '.join(POLICIES)})")
@@ -0,0 +1,229 @@
+"""
+Frame-time profiler for the 2048 game.
+
+Times named sections of each frame, such as handle_input or draw_board,
+keeps a rolling window of recent frames for percentiles and an on-screen
+overlay, and exports the frames as JSONL or as a Chrome trace (open it in
+chrome://tracing or Perfetto). To keep a whole session, record streams
+every frame to a file as it finishes, however long the session runs.
+
+Sections are hooked by wrapping methods on the instances being profiled
+only while the profiler is enabled. Disabling it removes the wrappers, so
+a disabled profiler adds no cost to the hooked calls.
+"""
+import json
+import time
+from collections import deque
+
+
+def frame_record(index, frame_ns, sections):
+    """Return the JSONL object for a frame, with section times in ms."""
+    totals = {}
+    for label, _, duration in sections:
+        totals[label] = totals.get(label, 0) + duration / 1e6
+    return {"frame": index, "ms": frame_ns / 1e6, "sections": totals}
+
+
+def trace_events(start, frame_ns, sections):
+    """Return the Chrome trace events for a frame and its sections."""
+    events = [{"name": "frame", "ph": "X", "ts": start / 1e3, "dur": frame_ns / 1e3, "pid": 0, "tid": 0}]
+    for label, section_start, duration in sections:
+        events.append({"name": label, "ph": "X", "ts": section_start / 1e3, "dur": duration / 1e3, "pid": 0, "tid": 0})
+    return events
+
+
+def percentile(values, fraction):
+    """Return the nearest-rank percentile of a sorted list of numbers."""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, round(fraction * len(values)) - 1))
+    return values[index]
+
+
+class FrameProfiler:
+    """Per-frame section timings with rolling percentiles."""
+
+    def __init__(self, history=3600, overlay_refresh=15):
+        """Initialize a disabled profiler keeping the last history frames.
+
+        The last frames feed the percentiles and the overlay, whose text is
+        re-rendered every overlay_refresh frames.
+        """
+        self.enabled = False
+        self.show_overlay = False
+        self.hooks = []
+        self.frames = deque(maxlen=history)
+        self.frame_start = None
+        self.sections = []
+        self.frame_count = 0
+        self.overlay_refresh = overlay_refresh
+        self._overlay = None
+        self._overlay_frame = -1
+
+        # File every frame is written to while recording, see record
+        self._record_file = None
+        self._record_trace = False
+        self._record_separator = ""
+
+    def instrument(self, target, name, label=None):
+        """Time calls to target.name under label (the method name by default)."""
+        self.hooks.append((target, name, label or name))
+        if self.enabled:
+            self._hook(target, name, label or name)
+
+    def _hook(self, target, name, label):
+        """Shadow a method on target with a timed wrapper."""
+        method = getattr(target, name)
+        sections = self.sections
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                sections.append((label, start, time.perf_counter_ns() - start))
+
+        setattr(target, name, timed)
+
+    def enable(self):
+        """Start timing the instrumented sections."""
+        if not self.enabled:
+            self.enabled = True
+            self.sections.clear()
+            for target, name, label in self.hooks:
+                self._hook(target, name, label)
+
+    def disable(self):
+        """Stop timing and restore the instrumented methods."""
+        if self.enabled:
+            self.enabled = False
+            for target, name, _ in self.hooks:
+                delattr(target, name)
+            self.sections.clear()
+            self.frame_start = None
+
+    def begin_frame(self):
+        """Mark the start of a frame."""
+        if self.enabled:
+            self.frame_start = time.perf_counter_ns()
+
+    def end_frame(self):
+        """Mark the end of a frame and store its section timings."""
+        if not self.enabled or self.frame_start is None:
+            return
+        end = time.perf_counter_ns()
+        frame = (self.frame_start, end - self.frame_start, tuple(self.sections))
+        self.frames.append(frame)
+        self.sections.clear()
+        self.frame_start = None
+        if self._record_file is not None:
+            self._write_frame(self.frame_count, frame)
+        self.frame_count += 1
+
+    def record(self, path):
+        """Write every frame from now on to path as it finishes.
+
+        Writes a Chrome trace for .json files and JSONL otherwise. The trace
+        is a JSON array of events, which trace viewers load even without its
+        closing bracket, so a session that crashes keeps its frames.
+        """
+        self.close()
+        self._record_file = open(path, "w")
+        self._record_trace = path.endswith(".json")
+        self._record_separator = ""
+        if self._record_trace:
+            self._record_file.write("[")
+
+    def _write_frame(self, index, frame):
+        """Append one frame to the recording."""
+        if self._record_trace:
+            for event in trace_events(*frame):
+                self._record_file.write(self._record_separator + "\n" + json.dumps(event))
+                self._record_separator = ","
+        else:
+            self._record_file.write(json.dumps(frame_record(index, *frame[1:])) + "\n")
+
+    def close(self):
+        """Finish and close the recording, if there is one."""
+        if self._record_file is None:
+            return
+        if self._record_trace:
+            self._record_file.write("\n]\n")
+        self._record_file.close()
+        self._record_file = None
+
+    def stats(self):
+        """Return {section: {"p50", "p95", "p99", "count"}} in milliseconds.
+
+        Each frame counts once per section, summing repeated calls, and the
+        whole frame is reported as "frame".
+        """
+        durations = {"frame": []}
+        for _, frame_ns, sections in self.frames:
+            durations["frame"].append(frame_ns / 1e6)
+            totals = {}
+            for label, _, duration in sections:
+                totals[label] = totals.get(label, 0) + duration
+            for label, total in totals.items():
+                durations.setdefault(label, []).append(total / 1e6)
+
+        stats = {}
+        for label, values in durations.items():
+            values.sort()
+            stats[label] = {
+                "p50": percentile(values, 0.50),
+                "p95": percentile(values, 0.95),
+                "p99": percentile(values, 0.99),
+                "count": len(values),
+            }
+        return stats
+
+    def overlay_surface(self, font, color, background):
+        """Return a surface listing the percentiles, rebuilt every few frames."""
+        if self._overlay is not None and self.frame_count - self._overlay_frame < self.overlay_refresh:
+            return self._overlay
+
+        import pygame
+
+        rows = [("section", "p50", "p95", "p99 ms")]
+        for label, stat in self.stats().items():
+            rows.append((label, f"{stat['p50']:.2f}", f"{stat['p95']:.2f}", f"{stat['p99']:.2f}"))
+        cells = [[font.render(text, True, color) for text in row] for row in rows]
+
+        # Labels are left aligned and numbers right aligned in their columns
+        gap = font.size("  ")[0]
+        widths = [max(row[i].get_width() for row in cells) for i in range(len(rows[0]))]
+        line_height = font.get_linesize()
+        surface = pygame.Surface((sum(widths) + gap * (len(widths) - 1) + 10, line_height * len(cells) + 10))
+        surface.fill(background)
+        for i, row in enumerate(cells):
+            x = 5
+            for j, cell in enumerate(row):
+                offset = 0 if j == 0 else widths[j] - cell.get_width()
+                surface.blit(cell, (x + offset, 5 + i * line_height))
+                x += widths[j] + gap
+
+        self._overlay = surface
+        self._overlay_frame = self.frame_count
+        return surface
+
+    def export_jsonl(self, path):
+        """Write one JSON object per frame in the rolling window, with section times in ms."""
+        with open(path, "w") as f:
+            for index, (_, frame_ns, sections) in enumerate(self.frames):
+                f.write(json.dumps(frame_record(index, frame_ns, sections)) + "\n")
+
+    def export_chrome_trace(self, path):
+        """Write the frames in the rolling window in the Chrome trace event format."""
+        events = []
+        for frame in self.frames:
+            events += trace_events(*frame)
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def export(self, path):
+        """Export the rolling window to path, as a Chrome trace for .json files and JSONL otherwise."""
+        if path.endswith(".json"):
+            self.export_chrome_trace(path)
+        else:
+            self.export_jsonl(path)
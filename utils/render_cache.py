@@ -0,0 +1,58 @@
+"""
+Render cache for the 2048 game.
+
+Keeps prebuilt surfaces (tiles with their rounded rect and centered value,
+rendered labels) so a frame is a set of blits instead of dozens of
+rasterizations. The cache holds a bounded number of entries and evicts the
+least recently used one when full. It is cleared whenever the theme
+changes, since every cached surface bakes in the theme's colors.
+"""
+from collections import OrderedDict
+
+
+class RenderCache:
+    """Bounded LRU cache of surfaces, invalidated on theme changes."""
+
+    def __init__(self, max_entries=256):
+        """Initialize an empty cache holding at most max_entries surfaces."""
+        self.max_entries = max_entries
+        self.theme = None
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def set_theme(self, theme):
+        """Switch to a theme, dropping every surface built for another one."""
+        if theme != self.theme:
+            self.entries.clear()
+            self.theme = theme
+
+    def clear(self):
+        """Drop every cached surface."""
+        self.entries.clear()
+
+    def discard(self, kind):
+        """Drop every surface whose key starts with kind."""
+        for key in [key for key in self.entries if key[0] == kind]:
+            del self.entries[key]
+
+    def get(self, key):
+        """Return the surface cached under key, or None."""
+        surface = self.entries.get(key)
+        if surface is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return surface
+
+    def put(self, key, surface):
+        """Cache a surface under key, evicting the least recently used if full."""
+        self.entries[key] = surface
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return surface
+
+    def __len__(self):
+        return len(self.entries)
@@ -0,0 +1,324 @@
+"""
+Compact binary replay logs for the 2048 game.
+
+A replay file is a header followed by any number of games, appended one
+after another:
+
+    file header:  b"K2048RPL" magic, u8 format version
+    game header:  u8 0xFF marker, u64 seed, u8 board size, u8 number of
+                  initial tiles, then each initial tile as its flat cell
+                  index (sized like a spawn) and u8 tile exponent
+    move chunks:  u8 move count n (1-254), ceil(n / 4) bytes of moves packed
+                  2 bits each (first move in the low bits), then the n
+                  spawns that followed those moves
+    game end:     u8 0, u32 final score
+
+A spawn is the flat cell index row * size + col with the top bit set when
+the tile is a 4. It takes one byte on boards of up to 128 cells and two
+bytes on larger ones. Initial tiles store their exponent instead, so a game
+can be recorded from any position, such as a resumed game. All integers are
+little endian.
+
+Version 1 files, whose initial tiles were stored as spawns, can still be read.
+
+Moves are written in chunks as the game goes, and the write buffer is
+flushed at arbitrary byte offsets, so a crash or kill can leave a game
+cut off anywhere, even halfway through a chunk. When the writer reopens
+such a file, it first truncates it back to the end of the last finished
+game, so new games never follow a partial one. The reader stops at a
+cut-off game at the end of the file. It is a generator that holds one
+game in memory at a time, so files with millions of games can be
+streamed.
+"""
+import os
+import struct
+
+from utils.game_logic import GameBoard
+
+MAGIC = b"K2048RPL"
+VERSION = 2
+
+# Moves are stored as their index in this tuple
+DIRECTIONS = ("up", "down", "left", "right")
+DIRECTION_CODES = {direction: code for code, direction in enumerate(DIRECTIONS)}
+
+GAME_MARKER = 0xFF
+MAX_CHUNK = 254
+
+# Seeds are stored as u64, so games with seeds outside 0..MAX_SEED can't be recorded
+MAX_SEED = 2**64 - 1
+
+_GAME_HEADER = struct.Struct("<QBB")
+_SCORE = struct.Struct("<I")
+
+
+def _spawn_format(size):
+    """Return the struct for one spawn on a board and the flag marking a 4."""
+    if size * size <= 128:
+        return struct.Struct("<B"), 0x80
+    return struct.Struct("<H"), 0x8000
+
+
+def pack_moves(codes):
+    """Pack a sequence of 2-bit move codes, four per byte."""
+    packed = bytearray((len(codes) + 3) // 4)
+    for i, code in enumerate(codes):
+        packed[i >> 2] |= code << ((i & 3) * 2)
+    return bytes(packed)
+
+
+def unpack_moves(data, count):
+    """Unpack count 2-bit move codes from bytes written by pack_moves."""
+    return bytes((data[i >> 2] >> ((i & 3) * 2)) & 3 for i in range(count))
+
+
+def board_tiles(board):
+    """Return the (row, col, value) tiles on a board, such as its starting tiles."""
+    return [
+        (row, col, value)
+        for row, values in enumerate(board.grid)
+        for col, value in enumerate(values)
+        if value != 0
+    ]
+
+
+class Replay:
+    """One recorded game.
+
+    moves holds the move codes (indices into DIRECTIONS) as bytes, and
+    initial and spawns hold (row, col, value) tiles: the starting tiles
+    and the tile spawned after each move.
+    """
+
+    __slots__ = ("seed", "size", "initial", "moves", "spawns", "score")
+
+    def __init__(self, seed, size, initial, moves, spawns, score):
+        self.seed = seed
+        self.size = size
+        self.initial = initial
+        self.moves = moves
+        self.spawns = spawns
+        self.score = score
+
+    @property
+    def directions(self):
+        """The moves as direction names."""
+        return [DIRECTIONS[code] for code in self.moves]
+
+    def positions(self):
+        """Replay the game, yielding (board, direction, score_gain) for each move.
+
+        board is the GameBoard after the move and its spawn. It is the same
+        object throughout, updated in place, so copy what you need to keep.
+        The position before the first move is the initial_board.
+        """
+        board = self.initial_board()
+        for code, (row, col, value) in zip(self.moves, self.spawns):
+            direction = DIRECTIONS[code]
+            getattr(board, f"move_{direction}")()
+            gain = board.score_increment
+            board.set_tile(row, col, value)
+            yield board, direction, gain
+
+    def initial_board(self):
+        """Return a GameBoard holding the game's starting tiles."""
+        board = GameBoard(self.size)
+        grid = [[0] * self.size for _ in range(self.size)]
+        for row, col, value in self.initial:
+            grid[row][col] = value
+        board.grid = grid
+        return board
+
+
+class ReplayWriter:
+    """Buffered, append-only writer of replay files."""
+
+    def __init__(self, path, buffer_size=65536):
+        """Open path for appending, writing the file header if it is new.
+
+        An existing file is truncated back to the end of its last finished
+        game, dropping whatever a crash left after it.
+        """
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            with open(path, "rb") as f:
+                header = f.read(len(MAGIC) + 1)
+                if header != MAGIC + bytes((VERSION,)):
+                    raise ValueError(f"{path} is not a version {VERSION} replay file")
+                end = f.tell()
+                try:
+                    for end, _ in _read_games(f, VERSION, decode=False):
+                        pass
+                except ValueError:
+                    # Keep the games before the damage
+                    pass
+            if end < os.path.getsize(path):
+                os.truncate(path, end)
+
+        self.file = open(path, "ab", buffering=buffer_size)
+        if self.file.tell() == 0:
+            self.file.write(MAGIC + bytes((VERSION,)))
+        self.size = None
+        self.spawn_format = None
+        self.moves = []
+        self.spawns = []
+
+    def _encode_spawns(self, spawns):
+        """Encode (row, col, value) spawns for the current board size."""
+        spawn_struct, four = self.spawn_format
+        return b"".join(
+            spawn_struct.pack(row * self.size + col | (four if value == 4 else 0))
+            for row, col, value in spawns
+        )
+
+    def _encode_tiles(self, tiles):
+        """Encode (row, col, value) initial tiles, which may hold any value."""
+        spawn_struct = self.spawn_format[0]
+        return b"".join(
+            spawn_struct.pack(row * self.size + col) + bytes((value.bit_length() - 1,))
+            for row, col, value in tiles
+        )
+
+    @property
+    def in_game(self):
+        """Whether a game has been started and not ended."""
+        return self.size is not None
+
+    def begin_game(self, seed, size, initial):
+        """Start recording a game from its seed and (row, col, value) starting tiles.
+
+        Raises ValueError for seeds outside 0 to MAX_SEED.
+        """
+        if self.in_game:
+            raise ValueError("the previous game was not ended")
+        if not 0 <= seed <= MAX_SEED:
+            raise ValueError(f"seed {seed} can't be recorded (replays store seeds from 0 to {MAX_SEED})")
+        self.size = size
+        self.spawn_format = _spawn_format(size)
+        self.file.write(bytes((GAME_MARKER,)) + _GAME_HEADER.pack(seed, size, len(initial)))
+        self.file.write(self._encode_tiles(initial))
+
+    def record_move(self, direction, spawn):
+        """Record a move and the (row, col, value) tile spawned after it."""
+        self.moves.append(DIRECTION_CODES[direction])
+        self.spawns.append(spawn)
+        if len(self.moves) == MAX_CHUNK:
+            self._write_chunk()
+
+    def _write_chunk(self):
+        """Write the pending moves as one chunk."""
+        if self.moves:
+            self.file.write(bytes((len(self.moves),)) + pack_moves(self.moves) + self._encode_spawns(self.spawns))
+            self.moves = []
+            self.spawns = []
+
+    def end_game(self, score):
+        """Finish the current game, recording its final score."""
+        if not self.in_game:
+            return
+        self._write_chunk()
+        self.file.write(b"\0" + _SCORE.pack(score))
+        self.size = None
+
+    def flush(self):
+        """Push buffered data to the file."""
+        self.file.flush()
+
+    def close(self):
+        """Close the file. An unfinished game is left without its end marker."""
+        if self.in_game:
+            self._write_chunk()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _decode_spawns(raw, size):
+    """Decode spawns written for a board size into (row, col, value) tiles."""
+    spawn_struct, four = _spawn_format(size)
+    spawns = []
+    for (code,) in spawn_struct.iter_unpack(raw):
+        index = code & ~four
+        spawns.append((index // size, index % size, 4 if code & four else 2))
+    return spawns
+
+
+def _decode_tiles(raw, size):
+    """Decode initial tiles written for a board size into (row, col, value) tiles."""
+    spawn_struct = _spawn_format(size)[0]
+    tile_struct = struct.Struct(spawn_struct.format + "B")
+    return [
+        (index // size, index % size, 1 << exponent)
+        for index, exponent in tile_struct.iter_unpack(raw)
+    ]
+
+
+def _read_games(f, version, decode=True):
+    """Read games from f, which is just past the file header.
+
+    Yields (end, replay) for every finished game, where end is the file
+    offset just past the game's end marker. With decode=False, replay is
+    None and moves and spawns are only skipped over. Stops at a game cut
+    off at the end of the file.
+    """
+    marker = f.read(1)
+    while marker:
+        if marker[0] != GAME_MARKER:
+            raise ValueError(f"corrupt replay file {f.name}")
+        data = f.read(_GAME_HEADER.size)
+        if len(data) != _GAME_HEADER.size:
+            return
+        seed, size, initial_count = _GAME_HEADER.unpack(data)
+        spawn_size = _spawn_format(size)[0].size
+        tile_size = spawn_size if version == 1 else spawn_size + 1
+        raw = f.read(initial_count * tile_size)
+        if len(raw) != initial_count * tile_size:
+            return
+        if decode:
+            initial = _decode_spawns(raw, size) if version == 1 else _decode_tiles(raw, size)
+        moves = bytearray()
+        spawns = []
+
+        while True:
+            marker = f.read(1)
+            if not marker:
+                # Cut off at the end of the file
+                return
+            count = marker[0]
+            if count == GAME_MARKER:
+                # Cut off, and the next game starts here
+                break
+            if count == 0:
+                data = f.read(_SCORE.size)
+                if len(data) != _SCORE.size:
+                    return
+                replay = None
+                if decode:
+                    replay = Replay(seed, size, initial, bytes(moves), spawns, _SCORE.unpack(data)[0])
+                yield f.tell(), replay
+                marker = f.read(1)
+                break
+            packed = f.read((count + 3) // 4)
+            raw = f.read(count * spawn_size)
+            if len(raw) != count * spawn_size:
+                return
+            if decode:
+                moves += unpack_moves(packed, count)
+                spawns += _decode_spawns(raw, size)
+
+
+def read_replays(path):
+    """Yield every finished game in a replay file as a Replay."""
+    with open(path, "rb") as f:
+        header = f.read(len(MAGIC) + 1)
+        if len(header) != len(MAGIC) + 1 or header[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a replay file")
+        version = header[-1]
+        if version not in (1, VERSION):
+            raise ValueError(f"unsupported replay version {version}")
+
+        for _, replay in _read_games(f, version):
+            yield replay
@@ -0,0 +1,85 @@
+"""
+Headless simulation for the 2048 game.
+
+Plays games with the policies from utils.policies. Games that are not
+recorded play on a utils.packed.PackedBoard when its size has line lookup
+tables, which moves faster than a GameBoard; recorded games need the move
+diffs only GameBoard tracks. Both engines spawn the same tiles from the
+same seed, so a game's result does not depend on which one plays it.
+Nothing imported from here touches pygame, so simulation workers start
+quickly and run on servers without a display.
+"""
+import random
+import time
+
+from utils.game_logic import GameBoard
+from utils.packed import PackedBoard, line_table
+from utils.policies import make_policy
+from utils.replay import ReplayWriter, board_tiles
+
+
+def play_game(policy_name, seed, size=4, depth=2, time_limit=None, max_moves=None, replay=None):
+    """Play one headless game and return its statistics.
+
+    The board's spawns and the policy's choices come from separate generators
+    derived from seed, so every policy faces the same spawn stream. If replay
+    is a ReplayWriter, the game is recorded to it.
+    """
+    policy = make_policy(policy_name, depth=depth, time_limit=time_limit,
+                         rng=random.Random(f"policy:{seed}"))
+    if replay is None and line_table(size) is not None:
+        board = PackedBoard(size, rng=random.Random(seed))
+    else:
+        board = GameBoard(size, rng=random.Random(seed))
+    if replay is not None:
+        board.track_moves = True
+        replay.begin_game(seed, size, board_tiles(board))
+    score = 0
+    moves = 0
+
+    start = time.perf_counter()
+    while board.moves_available():
+        if max_moves is not None and moves >= max_moves:
+            break
+        direction = policy(board)
+        if direction is None:
+            break
+        if getattr(board, f"move_{direction}")():
+            score += board.score_increment
+            board.add_random_tile()
+            moves += 1
+            if replay is not None:
+                replay.record_move(direction, board.last_diff.spawn)
+    elapsed = time.perf_counter() - start
+    if replay is not None:
+        replay.end_game(score)
+
+    return {
+        "policy": policy_name,
+        "seed": seed,
+        "score": score,
+        "max_tile": max(map(max, board.grid)),
+        "moves": moves,
+        "seconds": elapsed,
+        "moves_per_sec": moves / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def run_headless(policy_name, games, seed=0, size=4, depth=2, time_limit=None, max_moves=None, record=None):
+    """Play games one after another in this process and print one line per game.
+
+    With record, a path, every game is appended to that replay file.
+    """
+    results = []
+    replay = ReplayWriter(record) if record is not None else None
+    try:
+        for i in range(games):
+            result = play_game(policy_name, seed + i, size, depth, time_limit, max_moves, replay)
+            print(f"game {i + 1}: seed={result['seed']} score={result['score']} "
+                  f"max_tile={result['max_tile']} moves={result['moves']} "
+                  f"({result['moves_per_sec']:.0f} moves/sec)")
+            results.append(result)
+    finally:
+        if replay is not None:
+            replay.close()
+    return results
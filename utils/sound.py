@@ -0,0 +1,116 @@
+"""
+Sound playback for the 2048 game.
+
+Cues are played on a fixed pool of mixer channels reserved for the game,
+so playback never allocates or blocks the frame loop: when every channel
+is busy, the oldest one is reused. Frequent cues are rate limited, and a
+move plays a single cue however many tiles it merged.
+
+The backend does the actual playback. MixerBackend plays decoded
+pygame.mixer.Sound buffers, and NullBackend plays nothing and only
+records the calls, for headless runs, tests and benchmarks.
+"""
+import time
+
+# Shortest time in seconds between two plays of the same cue
+CUE_INTERVALS = {
+    "move": 0.05,
+    "merge": 0.08,
+    "win": 0.0,
+    "game_over": 0.0,
+}
+
+
+class NullBackend:
+    """Backend that plays nothing, recording (cue, channel) for each play."""
+
+    def __init__(self, channels=4):
+        """Initialize a silent backend with the given number of channels."""
+        self.channel_count = channels
+        self.played = []
+
+    def play(self, name, channel):
+        """Record the play and report it as played."""
+        self.played.append((name, channel))
+        return True
+
+    def busy(self, channel):
+        """Silent channels are never busy."""
+        return False
+
+
+class MixerBackend:
+    """Backend that plays decoded sounds on reserved pygame mixer channels."""
+
+    def __init__(self, sounds, channels=4):
+        """Initialize the backend.
+
+        sounds maps cue names to pygame.mixer.Sound objects (or None for
+        sounds that failed to load). It is read on every play, so it may be
+        filled in by a background loader after the game starts.
+        """
+        import pygame
+
+        if pygame.mixer.get_num_channels() < channels:
+            pygame.mixer.set_num_channels(channels)
+        # Keep the pool out of reach of pygame's automatic channel picking
+        pygame.mixer.set_reserved(channels)
+        self.sounds = sounds
+        self.channel_count = channels
+        self.channels = [pygame.mixer.Channel(i) for i in range(channels)]
+
+    def play(self, name, channel):
+        """Play a cue on a channel, returning False if its sound isn't loaded."""
+        sound = self.sounds.get(name)
+        if sound is None:
+            return False
+        self.channels[channel].play(sound)
+        return True
+
+    def busy(self, channel):
+        """Whether a channel is still playing."""
+        return self.channels[channel].get_busy()
+
+
+class SoundManager:
+    """Plays game cues on a fixed channel pool, throttling frequent ones."""
+
+    def __init__(self, backend, intervals=CUE_INTERVALS, clock=time.monotonic):
+        """Initialize the manager with a backend from this module."""
+        self.backend = backend
+        self.intervals = intervals
+        self.clock = clock
+        self.last_played = {}
+        self.next_channel = 0
+        self.throttled = 0
+
+    def _channel(self):
+        """Pick an idle channel, or the least recently started one if all are busy."""
+        count = self.backend.channel_count
+        channel = self.next_channel
+        for offset in range(count):
+            candidate = (self.next_channel + offset) % count
+            if not self.backend.busy(candidate):
+                channel = candidate
+                break
+        self.next_channel = (channel + 1) % count
+        return channel
+
+    def play(self, name):
+        """Play a cue unless it played too recently, returning whether it played."""
+        now = self.clock()
+        last = self.last_played.get(name)
+        if last is not None and now - last < self.intervals.get(name, 0.0):
+            self.throttled += 1
+            return False
+
+        if not self.backend.play(name, self._channel()):
+            return False
+        self.last_played[name] = now
+        return True
+
+    def play_move(self, diff):
+        """Play the cue for a move from its MoveDiff: one merge cue or a move cue."""
+        if any(move.merged for move in diff.moves):
+            return self.play("merge")
+        return self.play("move")
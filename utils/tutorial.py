@@ -44,6 +44,11 @@ class Tutorial:
         self.prev_button_rect = pygame.Rect(0, 0, 0, 0)
         self.close_button_rect = pygame.Rect(0, 0, 0, 0)
         
+        # Composed slides keyed by (slide, theme, panel width, panel height),
+        # and wrapped content lines keyed by (slide, width, font)
+        self.slide_cache = {}
+        self.wrap_cache = {}
+        
     def next_slide(self):
         """Go to the next slide."""
         if self.current_slide < len(self.slides) - 1:
@@ -58,102 +63,134 @@ class Tutorial:
     
     def draw(self, screen):
         """Draw the tutorial slide."""
-        from utils.constants import COLORS
-        
         theme = "dark" if self.game.settings.dark_mode else "light"
-        colors = COLORS[theme]
+        scaled = self.game.scaled
         
-        # Draw tutorial panel
-        panel_width = 500
-        panel_height = 350
+        # Tutorial panel, centered on the screen
+        panel_width = scaled(500)
+        panel_height = scaled(350)
         panel_x = (self.game.screen_width - panel_width) // 2
         panel_y = (self.game.screen_height - panel_height) // 2
         
+        # Slides are composed once per theme and size, then drawn with one blit
+        key = (self.current_slide, theme, panel_width, panel_height)
+        slide = self.slide_cache.get(key)
+        if slide is None:
+            slide = self.build_slide(self.current_slide, theme, panel_width, panel_height)
+            self.slide_cache[key] = slide
+        surface, prev_button_rect, next_button_rect, close_button_rect = slide
+        screen.blit(surface, (panel_x, panel_y))
+        
+        # Store button rects for click handling
+        self.prev_button_rect = prev_button_rect.move(panel_x, panel_y) if prev_button_rect else pygame.Rect(0, 0, 0, 0)
+        self.next_button_rect = next_button_rect.move(panel_x, panel_y)
+        self.close_button_rect = close_button_rect.move(panel_x, panel_y)
+    
+    def build_slide(self, index, theme, panel_width, panel_height):
+        """Compose a slide on its own surface.
+        
+        Returns the surface and the previous (None on the first slide), next
+        and close button rects relative to the panel.
+        """
+        from utils.constants import COLORS
+        
+        colors = COLORS[theme]
+        scaled = self.game.scaled
+        surface = pygame.Surface((panel_width, panel_height), pygame.SRCALPHA)
+        
+        # Draw tutorial panel
         pygame.draw.rect(
-            screen,
+            surface,
             colors["grid_background"],
-            (panel_x, panel_y, panel_width, panel_height),
-            border_radius=10
+            (0, 0, panel_width, panel_height),
+            border_radius=scaled(10)
         )
         
         # Draw slide content
-        slide = self.slides[self.current_slide]
+        slide = self.slides[index]
         
         # Draw title
         title_text = self.game.font.render(slide["title"], True, colors["text"])
-        title_rect = title_text.get_rect(center=(panel_x + panel_width // 2, panel_y + 50))
-        screen.blit(title_text, title_rect)
+        title_rect = title_text.get_rect(center=(panel_width // 2, scaled(50)))
+        surface.blit(title_text, title_rect)
         
         # Draw content (wrap text)
-        content_lines = self.wrap_text(slide["content"], panel_width - 60, self.game.small_font)
+        content_lines = self.wrapped_content(index, panel_width - scaled(60), self.game.small_font)
         for i, line in enumerate(content_lines):
             line_text = self.game.small_font.render(line, True, colors["text"])
-            screen.blit(line_text, (panel_x + 30, panel_y + 100 + i * 30))
+            surface.blit(line_text, (scaled(30), scaled(100 + i * 30)))
         
         # Draw navigation buttons
-        button_width = 100
-        button_height = 40
-        button_y = panel_y + panel_height - 60
+        button_width = scaled(100)
+        button_height = scaled(40)
+        button_y = panel_height - scaled(60)
         
         # Previous button
-        if self.current_slide > 0:
-            prev_button_rect = pygame.Rect(panel_x + 30, button_y, button_width, button_height)
+        prev_button_rect = None
+        if index > 0:
+            prev_button_rect = pygame.Rect(scaled(30), button_y, button_width, button_height)
             pygame.draw.rect(
-                screen,
+                surface,
                 colors["button"],
                 prev_button_rect,
-                border_radius=5
+                border_radius=scaled(5)
             )
             prev_text = self.game.small_font.render("Previous", True, colors["button_text"])
             prev_text_rect = prev_text.get_rect(center=prev_button_rect.center)
-            screen.blit(prev_text, prev_text_rect)
-            self.prev_button_rect = prev_button_rect
-        else:
-            self.prev_button_rect = pygame.Rect(0, 0, 0, 0)
+            surface.blit(prev_text, prev_text_rect)
         
         # Next/Finish button
-        next_button_rect = pygame.Rect(panel_x + panel_width - 30 - button_width, button_y, button_width, button_height)
+        next_button_rect = pygame.Rect(panel_width - scaled(30) - button_width, button_y, button_width, button_height)
         pygame.draw.rect(
-            screen,
+            surface,
             colors["button"],
             next_button_rect,
-            border_radius=5
+            border_radius=scaled(5)
         )
         
-        if self.current_slide < len(self.slides) - 1:
+        if index < len(self.slides) - 1:
             next_text = self.game.small_font.render("Next", True, colors["button_text"])
         else:
             next_text = self.game.small_font.render("Finish", True, colors["button_text"])
             
         next_text_rect = next_text.get_rect(center=next_button_rect.center)
-        screen.blit(next_text, next_text_rect)
-        self.next_button_rect = next_button_rect
+        surface.blit(next_text, next_text_rect)
         
         # Close button
-        close_button_rect = pygame.Rect(panel_x + panel_width - 40, panel_y + 10, 30, 30)
+        close_button_rect = pygame.Rect(panel_width - scaled(40), scaled(10), scaled(30), scaled(30))
         pygame.draw.rect(
-            screen,
+            surface,
             colors["button"],
             close_button_rect,
-            border_radius=15
+            border_radius=scaled(15)
         )
         
         # Draw X
         x_text = self.game.font.render("×", True, colors["button_text"])
         x_rect = x_text.get_rect(center=close_button_rect.center)
-        screen.blit(x_text, x_rect)
-        self.close_button_rect = close_button_rect
+        surface.blit(x_text, x_rect)
         
         # Draw slide indicator
         for i in range(len(self.slides)):
-            indicator_x = panel_x + panel_width // 2 - (len(self.slides) * 15) // 2 + i * 15
-            indicator_y = panel_y + panel_height - 25
-            indicator_radius = 5
+            indicator_x = panel_width // 2 + scaled(i * 15 - (len(self.slides) * 15) // 2)
+            indicator_y = panel_height - scaled(25)
+            indicator_radius = scaled(5)
             
-            if i == self.current_slide:
-                pygame.draw.circle(screen, colors["text"], (indicator_x, indicator_y), indicator_radius)
+            if i == index:
+                pygame.draw.circle(surface, colors["text"], (indicator_x, indicator_y), indicator_radius)
             else:
-                pygame.draw.circle(screen, colors["text"], (indicator_x, indicator_y), indicator_radius, 1)
+                pygame.draw.circle(surface, colors["text"], (indicator_x, indicator_y), indicator_radius, 1)
+        
+        return surface.convert_alpha(), prev_button_rect, next_button_rect, close_button_rect
+    
+    def wrapped_content(self, index, max_width, font):
+        """Return the wrapped content lines of a slide, cached per width and font."""
+        key = (index, max_width, font)
+        lines = self.wrap_cache.get(key)
+        if lines is None:
+            lines = self.wrap_text(self.slides[index]["content"], max_width, font)
+            self.wrap_cache[key] = lines
+        return lines
     
     def wrap_text(self, text, max_width, font):
         """Wrap text to fit within a given width."""